@@ -1,3 +1,15 @@
 from .datepicker import Datepicker
 from .settings import DatepickerSettings
 from .custom_action import DatepickerCustomAction
+from .cache import MarkupCache, SerializedMarkup, markup_cache
+from .callback_data import CompactCallbackData
+from .coalescer import NavigationCoalescer
+from .scheduler import EditScheduler, TokenBucket
+from .instrumentation import DatepickerObserver, MetricsCollector
+from .availability import DisabledDates, IntervalSet, OccupiedSlots
+from .provider import AvailabilityProvider, CachedAvailabilityProvider
+from .backends import CacheBackend, MemoryBackend, MmapBackend
+from .i18n import DatepickerLocale, LocaleRegistry, locales, current_locale
+from .router import DatepickerRouter
+from .session import DatepickerSession, SessionStore, MemorySessionStore, AiogramSessionStore, current_session
+from .profiler import DatepickerProfiler
@@ -0,0 +1,212 @@
+import calendar
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+DateRange = Union[date, Tuple[date, date]]
+DatetimeRange = Tuple[datetime, datetime]
+
+
+def to_minute(value: datetime) -> int:
+    return value.toordinal() * 1440 + value.hour * 60 + value.minute
+
+
+class IntervalSet:
+    def __init__(self, intervals: Iterable[Tuple[int, int]] = ()):
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self.digest = 0
+
+        merged = []
+        for start, end in sorted(intervals):
+            if start > end:
+                raise ValueError(f'interval start {start} is greater than end {end}')
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+
+        for start, end in merged:
+            self._starts.append(start)
+            self._ends.append(end)
+            self.digest ^= hash((start, end))
+
+    def add(self, start: int, end: int = None):
+        if end is None:
+            end = start
+        if start > end:
+            raise ValueError(f'interval start {start} is greater than end {end}')
+
+        left = bisect_left(self._ends, start - 1)
+        right = bisect_right(self._starts, end + 1)
+        if left < right:
+            start = min(start, self._starts[left])
+            end = max(end, self._ends[right - 1])
+        self._replace(left, right, [(start, end)])
+
+    def remove(self, start: int, end: int = None):
+        if end is None:
+            end = start
+        if start > end:
+            raise ValueError(f'interval start {start} is greater than end {end}')
+
+        left = bisect_right(self._ends, start - 1)
+        right = bisect_left(self._starts, end + 1)
+        if left >= right:
+            return
+
+        remaining = []
+        if self._starts[left] < start:
+            remaining.append((self._starts[left], start - 1))
+        if self._ends[right - 1] > end:
+            remaining.append((end + 1, self._ends[right - 1]))
+        self._replace(left, right, remaining)
+
+    def _replace(self, left: int, right: int, intervals: List[Tuple[int, int]]):
+        for i in range(left, right):
+            self.digest ^= hash((self._starts[i], self._ends[i]))
+        for interval in intervals:
+            self.digest ^= hash(interval)
+
+        self._starts[left:right] = [start for start, _ in intervals]
+        self._ends[left:right] = [end for _, end in intervals]
+
+    def __contains__(self, value: int) -> bool:
+        i = bisect_right(self._starts, value) - 1
+        return i >= 0 and value <= self._ends[i]
+
+    def find(self, value: int) -> Optional[Tuple[int, int]]:
+        i = bisect_right(self._starts, value) - 1
+        if i >= 0 and value <= self._ends[i]:
+            return self._starts[i], self._ends[i]
+        return None
+
+    def covers(self, start: int, end: int) -> bool:
+        i = bisect_right(self._starts, start) - 1
+        return i >= 0 and end <= self._ends[i]
+
+    def overlaps(self, start: int, end: int) -> bool:
+        i = bisect_left(self._ends, start)
+        return i < len(self._starts) and self._starts[i] <= end
+
+    def overlapping(self, start: int, end: int) -> Iterator[Tuple[int, int]]:
+        for i in range(bisect_left(self._ends, start), len(self._starts)):
+            if self._starts[i] > end:
+                break
+            yield max(self._starts[i], start), min(self._ends[i], end)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return zip(self._starts, self._ends)
+
+    def __len__(self):
+        return len(self._starts)
+
+
+class DisabledDates(IntervalSet):
+    def __init__(self, dates: Iterable[DateRange] = ()):
+        super().__init__(self._to_interval(value) for value in dates)
+
+    @staticmethod
+    def _to_interval(value: DateRange) -> Tuple[int, int]:
+        if isinstance(value, date):
+            return value.toordinal(), value.toordinal()
+        start, end = value
+        return start.toordinal(), end.toordinal()
+
+    def add(self, start: date, end: date = None):
+        super().add(start.toordinal(), (end or start).toordinal())
+
+    def remove(self, start: date, end: date = None):
+        super().remove(start.toordinal(), (end or start).toordinal())
+
+    def __contains__(self, value: date) -> bool:
+        return super().__contains__(value.toordinal())
+
+
+class OccupiedSlots(IntervalSet):
+    def __init__(self, ranges: Iterable[DatetimeRange] = ()):
+        super().__init__(self._to_interval(*value) for value in ranges)
+
+    @staticmethod
+    def _to_interval(start: datetime, end: datetime) -> Tuple[int, int]:
+        return to_minute(start), to_minute(end) - 1
+
+    def add(self, start: datetime, end: datetime):
+        super().add(*self._to_interval(start, end))
+
+    def remove(self, start: datetime, end: datetime):
+        super().remove(*self._to_interval(start, end))
+
+    def __contains__(self, value: datetime) -> bool:
+        return super().__contains__(to_minute(value))
+
+
+class Availability:
+    def __init__(self, min_date: Optional[date] = None, max_date: Optional[date] = None,
+                 disabled_dates: Optional[IntervalSet] = None):
+        if min_date and max_date and min_date > max_date:
+            raise ValueError('min_date should not be greater than max_date')
+
+        self.min_date = min_date
+        self.max_date = max_date
+        self.disabled_dates = disabled_dates
+
+        self._min = min_date.toordinal() if min_date else 1
+        self._max = max_date.toordinal() if max_date else date.max.toordinal()
+
+    @property
+    def unrestricted(self) -> bool:
+        return self.min_date is None and self.max_date is None and not self.disabled_dates
+
+    @property
+    def digest(self) -> int:
+        return self.disabled_dates.digest if self.disabled_dates is not None else 0
+
+    def _range_disabled(self, start: int, end: int) -> bool:
+        if end < self._min or start > self._max:
+            return True
+        start, end = max(start, self._min), min(end, self._max)
+        return self.disabled_dates is not None and self.disabled_dates.covers(start, end)
+
+    def is_day_disabled(self, _date: date) -> bool:
+        return self._range_disabled(_date.toordinal(), _date.toordinal())
+
+    def is_month_disabled(self, year: int, month: int) -> bool:
+        start = date(year, month, 1).toordinal()
+        return self._range_disabled(start, start + calendar.monthrange(year, month)[1] - 1)
+
+    def is_year_disabled(self, year: int) -> bool:
+        return self._range_disabled(date(year, 1, 1).toordinal(), date(year, 12, 31).toordinal())
+
+    def is_range_enabled(self, start: date, end: date) -> bool:
+        start, end = start.toordinal(), end.toordinal()
+        if start < self._min or end > self._max:
+            return False
+        return self.disabled_dates is None or not self.disabled_dates.overlaps(start, end)
+
+    def next_enabled(self, ordinal: int, step: int) -> Optional[int]:
+        if step > 0 and ordinal > self._max or step < 0 and ordinal < self._min:
+            return None
+        ordinal = min(max(ordinal, self._min), self._max)
+
+        interval = self.disabled_dates.find(ordinal) if self.disabled_dates is not None else None
+        if interval is not None:
+            ordinal = interval[1] + 1 if step > 0 else interval[0] - 1
+            if not self._min <= ordinal <= self._max:
+                return None
+        return ordinal
+
+    def month_mask(self, year: int, month: int) -> int:
+        start = date(year, month, 1).toordinal()
+        end = start + calendar.monthrange(year, month)[1] - 1
+
+        mask = 0
+        if start < self._min:
+            mask |= (1 << (min(self._min, end + 1) - start + 1)) - 2
+        if end > self._max:
+            first = max(self._max + 1, start) - start + 1
+            mask |= ((1 << (end - start + 2)) - 1) ^ ((1 << first) - 1)
+        if self.disabled_dates is not None:
+            for disabled_start, disabled_end in self.disabled_dates.overlapping(start, end):
+                mask |= ((1 << (disabled_end - start + 2)) - 1) ^ ((1 << (disabled_start - start + 1)) - 1)
+        return mask
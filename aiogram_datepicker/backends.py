@@ -0,0 +1,128 @@
+import mmap
+import os
+import struct
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Optional
+from zlib import crc32
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: str):
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class MemoryBackend(CacheBackend):
+    def __init__(self, maxsize: int = 1024):
+        if maxsize <= 0:
+            raise ValueError('maxsize should be positive')
+
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+_magic = b'DPMC'
+_version = 1
+_file_header = struct.Struct('<4sIII')
+_file_header_size = 64
+_slot_header = struct.Struct('<16sII')
+
+
+class MmapBackend(CacheBackend):
+    def __init__(self, path: str, slots: int = 1024, slot_size: int = 8192):
+        if slots <= 0:
+            raise ValueError('slots should be positive')
+        if slot_size <= _slot_header.size:
+            raise ValueError(f'slot_size should be greater than {_slot_header.size}')
+
+        self.path = path
+        self.slots = slots
+        self.slot_size = slot_size
+        self.oversized = 0
+
+        size = _file_header_size + slots * slot_size
+        header = _file_header.pack(_magic, _version, slots, slot_size)
+
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            if os.fstat(fd).st_size != size or os.read(fd, _file_header.size) != header:
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, size)
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.write(fd, header)
+            self._mmap = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+    def _locate(self, key: str):
+        digest = blake2b(key.encode(), digest_size=16).digest()
+        return digest, _file_header_size + int.from_bytes(digest[:8], 'little') % self.slots * self.slot_size
+
+    def get(self, key: str) -> Optional[str]:
+        digest, offset = self._locate(key)
+        slot_digest, length, checksum = _slot_header.unpack_from(self._mmap, offset)
+        if slot_digest != digest or length > self.slot_size - _slot_header.size:
+            return None
+
+        start = offset + _slot_header.size
+        payload = self._mmap[start:start + length]
+        if crc32(payload) != checksum:
+            return None
+        return payload.decode()
+
+    def set(self, key: str, value: str):
+        payload = value.encode()
+        if len(payload) > self.slot_size - _slot_header.size:
+            self.oversized += 1
+            return
+
+        digest, offset = self._locate(key)
+        _slot_header.pack_into(self._mmap, offset, bytes(16), 0, 0)
+        start = offset + _slot_header.size
+        self._mmap[start:start + len(payload)] = payload
+        _slot_header.pack_into(self._mmap, offset, digest, len(payload), crc32(payload))
+
+    def clear(self):
+        for offset in range(_file_header_size, len(self._mmap), self.slot_size):
+            _slot_header.pack_into(self._mmap, offset, bytes(16), 0, 0)
+
+    def close(self):
+        self._mmap.close()
@@ -0,0 +1,40 @@
+from typing import Dict
+
+from aiogram.types import InlineKeyboardButton
+
+
+class StaticButton(InlineKeyboardButton):
+    def __init__(self, text: str, callback_data: str):
+        super().__init__(text=text, callback_data=callback_data)
+        self._frozen = True
+
+    def __setattr__(self, key, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError(f'{self.__class__.__name__} is immutable')
+        super().__setattr__(key, value)
+
+    def __setitem__(self, key, value):
+        raise AttributeError(f'{self.__class__.__name__} is immutable')
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class ButtonPool:
+    __slots__ = ('callback_data', '_buttons')
+
+    def __init__(self, callback_data: str):
+        self.callback_data = callback_data
+        self._buttons: Dict[str, StaticButton] = {}
+
+    def get(self, text: str) -> StaticButton:
+        button = self._buttons.get(text)
+        if button is None:
+            button = self._buttons[text] = StaticButton(text, self.callback_data)
+        return button
+
+    def __len__(self):
+        return len(self._buttons)
@@ -0,0 +1,150 @@
+import json
+import logging
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Hashable, Optional
+
+from aiogram.types import InlineKeyboardMarkup
+
+from .backends import CacheBackend
+
+logger = logging.getLogger(__name__)
+
+
+class SerializedMarkup(str):
+    _markup: InlineKeyboardMarkup = None
+
+    @property
+    def markup(self) -> InlineKeyboardMarkup:
+        if self._markup is None:
+            self._markup = InlineKeyboardMarkup.to_object(json.loads(self))
+        return self._markup
+
+    @markup.setter
+    def markup(self, value: InlineKeyboardMarkup):
+        self._markup = value
+
+
+class CachedMarkup:
+    __slots__ = ('_markup', '_serialized')
+
+    def __init__(self, markup: InlineKeyboardMarkup = None, serialized: SerializedMarkup = None):
+        self._markup = markup
+        self._serialized = serialized
+
+    @property
+    def markup(self) -> InlineKeyboardMarkup:
+        if self._markup is None:
+            self._markup = self._serialized.markup
+        return self._markup
+
+    @property
+    def serialized(self) -> SerializedMarkup:
+        if self._serialized is None:
+            self._serialized = SerializedMarkup(self._markup.as_json())
+            self._serialized.markup = self._markup
+        return self._serialized
+
+
+class MarkupCache:
+    def __init__(self, maxsize: int = 256, backend: CacheBackend = None):
+        if maxsize < 0:
+            raise ValueError('maxsize should be positive or 0 to disable caching')
+
+        self.maxsize = maxsize
+        self.backend = backend
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._data = OrderedDict()
+        self._today = date.today()
+
+    def _check_today(self) -> date:
+        today = date.today()
+        if today != self._today:
+            self._data.clear()
+            self._today = today
+        return today
+
+    @property
+    def today(self) -> date:
+        return self._check_today()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        self._check_today()
+
+        try:
+            value = self._data[key]
+        except KeyError:
+            value = self._get_shared(key)
+            if value is None:
+                self.misses += 1
+                return None
+
+            self.shared_hits += 1
+            self._store(key, value)
+            return value
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        if not self.maxsize:
+            return
+
+        self._store(key, value)
+        if self.backend is not None:
+            try:
+                self.backend.set(repr(key), value.serialized)
+            except Exception:
+                logger.exception('Failed to store datepicker markup in %s', type(self.backend).__name__)
+
+    def _get_shared(self, key: Hashable) -> Optional[CachedMarkup]:
+        if self.backend is None or not self.maxsize:
+            return None
+
+        try:
+            serialized = self.backend.get(repr(key))
+        except Exception:
+            logger.exception('Failed to load datepicker markup from %s', type(self.backend).__name__)
+            return None
+        return CachedMarkup(serialized=SerializedMarkup(serialized)) if serialized is not None else None
+
+    def _store(self, key: Hashable, value: Any):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def resize(self, maxsize: int):
+        if maxsize < 0:
+            raise ValueError('maxsize should be positive or 0 to disable caching')
+
+        self.maxsize = maxsize
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._data.clear()
+        self.hits = self.shared_hits = self.misses = self.evictions = 0
+
+    def info(self) -> dict:
+        return {
+            'hits': self.hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+        }
+
+    def __len__(self):
+        return len(self._data)
+
+
+markup_cache = MarkupCache()
@@ -1,3 +1,150 @@
+from datetime import date
+from typing import Dict, Union
+
+from aiogram import types
+from aiogram.dispatcher.filters import Filter
 from aiogram.utils.callback_data import CallbackData
 
-datepicker_callback = CallbackData('datepicker', 'view', 'action', 'year', 'month', 'day')
+
+class DatepickerCallbackData(CallbackData):
+    def __init__(self, prefix: str = 'datepicker', sep: str = ':'):
+        super().__init__(prefix, 'view', 'action', 'year', 'month', 'day', 'extra', sep=sep)
+
+    def new(self, view: str, action: str, year: Union[int, str], month: Union[int, str], day: Union[int, str],
+            extra: str = '') -> str:
+        callback_data = super().new(view, action, year, month, day, extra)
+        return callback_data if extra else callback_data[:-len(self.sep)]
+
+    def parse(self, callback_data: str) -> Dict[str, str]:
+        if callback_data.count(self.sep) == len(self._part_names) - 1:
+            callback_data += self.sep
+        return super().parse(callback_data)
+
+
+datepicker_callback = DatepickerCallbackData()
+
+max_callback_size = 64
+
+_alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_'
+_alphabet_index = {char: i for i, char in enumerate(_alphabet)}
+
+_view_codes = {'': '-', 'day': 'd', 'month': 'm', 'year': 'y', 'time': 't'}
+_action_codes = {
+    'ignore': 'i',
+    'select': 's',
+    'set-view': 'v',
+    'set-day': 'D',
+    'set-month': 'M',
+    'set-year': 'Y',
+    'set-time': 'T',
+    'prev-month': 'p',
+    'next-month': 'n',
+    'prev-year': 'P',
+    'next-year': 'N',
+    'prev-years': 'b',
+    'next-years': 'f',
+    'prev-day': 'k',
+    'next-day': 'K',
+}
+_custom_action_code = '.'
+
+_views = {code: view for view, code in _view_codes.items()}
+_actions = {code: action for action, code in _action_codes.items()}
+
+
+def encode_ordinal(value: int) -> str:
+    return _alphabet[value >> 18 & 63] + _alphabet[value >> 12 & 63] + _alphabet[value >> 6 & 63] + _alphabet[value & 63]
+
+
+def decode_ordinal(value: str) -> int:
+    index = _alphabet_index
+    return index[value[0]] << 18 | index[value[1]] << 12 | index[value[2]] << 6 | index[value[3]]
+
+
+def encode_bits(value: int, length: int) -> str:
+    return ''.join(_alphabet[value >> shift & 63] for shift in range(6 * (length - 1), -1, -6))
+
+
+def decode_bits(value: str) -> int:
+    result = 0
+    for char in value:
+        result = result << 6 | _alphabet_index[char]
+    return result
+
+
+class CompactCallbackData:
+    def __init__(self, prefix: str = 'dp', sep: str = ':'):
+        if not prefix:
+            raise ValueError("Prefix can't be empty")
+        if sep in prefix:
+            raise ValueError(f"Separator {sep!r} can't be used in prefix")
+
+        self.prefix = prefix
+        self.sep = sep
+        self._head = prefix + sep
+
+    def new(self, view: str, action: str, year: Union[int, str], month: Union[int, str], day: Union[int, str],
+            extra: str = '') -> str:
+        year, month, day = int(year), int(month), int(day)
+        ordinal = 0 if year <= 0 else date(year, month, day).toordinal()
+
+        code = _action_codes.get(action)
+        if code is None:
+            if self.sep in action:
+                raise ValueError(f"Symbol {self.sep!r} is defined as the separator and can't be used in actions")
+            code = _custom_action_code + action
+
+        callback_data = self._head + _view_codes[view] + encode_ordinal(ordinal) + code
+        if extra:
+            if self.sep in extra:
+                raise ValueError(f"Symbol {self.sep!r} is defined as the separator and can't be used in extra")
+            callback_data += self.sep + extra
+
+        if len(callback_data.encode()) > max_callback_size:
+            raise ValueError('Resulted callback data is too long!')
+
+        return callback_data
+
+    def parse(self, callback_data: str) -> Dict[str, Union[str, int]]:
+        if not callback_data.startswith(self._head):
+            raise ValueError("Passed callback data can't be parsed with that prefix.")
+
+        body, _, extra = callback_data[len(self._head):].partition(self.sep)
+        try:
+            view = _views[body[0]]
+            ordinal = decode_ordinal(body[1:5])
+            code = body[5:]
+            action = code[1:] if code[:1] == _custom_action_code else _actions[code]
+        except (KeyError, IndexError):
+            raise ValueError('Invalid callback data!')
+
+        if ordinal:
+            _date = date.fromordinal(ordinal)
+            year, month, day = _date.year, _date.month, _date.day
+        else:
+            year = month = day = -1
+
+        return {'@': self.prefix, 'view': view, 'action': action, 'year': year, 'month': month, 'day': day,
+                'extra': extra}
+
+    def filter(self) -> 'CompactCallbackDataFilter':
+        return CompactCallbackDataFilter(self)
+
+
+class CompactCallbackDataFilter(Filter):
+    def __init__(self, factory: CompactCallbackData):
+        self.factory = factory
+
+    @classmethod
+    def validate(cls, full_config):
+        raise ValueError("That filter can't be used in filters factory!")
+
+    async def check(self, query: types.CallbackQuery):
+        try:
+            data = self.factory.parse(query.data)
+        except ValueError:
+            return False
+        return {'callback_data': data}
+
+
+compact_datepicker_callback = CompactCallbackData()
@@ -0,0 +1,42 @@
+import asyncio
+from typing import Dict, Tuple
+
+from aiogram.types import CallbackQuery
+
+navigation_actions = frozenset(('prev-month', 'next-month', 'prev-year', 'next-year', 'prev-years', 'next-years'))
+
+
+class NavigationCoalescer:
+    def __init__(self, window: float = 0.3, actions=navigation_actions):
+        if window <= 0:
+            raise ValueError('window should be positive')
+
+        self.window = window
+        self.actions = frozenset(actions)
+        self.coalesced = 0
+
+        self._pending: Dict[Tuple[int, int], asyncio.Event] = {}
+
+    async def wait(self, query: CallbackQuery) -> bool:
+        if query.message is None:
+            return True
+        key = (query.message.chat.id, query.message.message_id)
+
+        previous = self._pending.get(key)
+        if previous is not None:
+            previous.set()
+
+        superseded = self._pending[key] = asyncio.Event()
+        try:
+            await asyncio.wait_for(superseded.wait(), self.window)
+        except asyncio.TimeoutError:
+            return True
+        finally:
+            if self._pending.get(key) is superseded:
+                del self._pending[key]
+
+        self.coalesced += 1
+        return False
+
+    def __len__(self):
+        return len(self._pending)
@@ -3,13 +3,10 @@ from datetime import date
 
 from aiogram.types import CallbackQuery
 from aiogram.types import InlineKeyboardButton
-from aiogram.utils.callback_data import CallbackData
-
-from .callback_data import datepicker_callback
 
 
 class DatepickerCustomAction(ABC):
-    _datepicker_callback: CallbackData = datepicker_callback
+    __slots__ = ('settings', 'set_view', '_datepicker_callback')
 
     action: str
     label: str
@@ -18,9 +15,10 @@ class DatepickerCustomAction(ABC):
         super().__init__()
         self.settings = settings
         self.set_view = set_view
+        self._datepicker_callback = settings.callback_data
 
-    def _get_callback(self, view: str, action: str, year: int, month: int, day: int) -> str:
-        return self._datepicker_callback.new(view, action, year, month, day)
+    def _get_callback(self, view: str, action: str, year: int, month: int, day: int, extra: str = '') -> str:
+        return self._datepicker_callback.new(view, action, year, month, day, extra)
 
     @abstractmethod
     def get_action(self, view: str, year: int, month: int, day: int) -> InlineKeyboardButton:
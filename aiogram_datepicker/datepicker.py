@@ -1,37 +1,335 @@
+import json
+import logging
+from collections.abc import Mapping
 from datetime import datetime, date
+from time import perf_counter
+from typing import Dict, Union, Iterable, Iterator, Callable, Type, Tuple, Optional, List
 
-from aiogram.types import CallbackQuery
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.callback_data import CallbackData
+from aiogram.utils.exceptions import MessageNotModified
 
+from .cache import MarkupCache, SerializedMarkup
+from .callback_data import CompactCallbackData, DatepickerCallbackData, datepicker_callback
+from .coalescer import NavigationCoalescer
+from .custom_action import DatepickerCustomAction
+from .helpers import markup_digest
+from .i18n import LocaleRegistry, locales, use_locale
+from .instrumentation import DatepickerObserver
+from .profiler import DatepickerProfiler
+from .scheduler import EditScheduler
+from .session import DatepickerSession, SessionCallbackData, SessionStore, current_session
 from .settings import DatepickerSettings
-from .views import DayView, MonthView, YearView
+from .views import BaseView, DayView, MonthView, YearView, TimeView
+
+logger = logging.getLogger(__name__)
+
+Selection = Union[date, Tuple[date, date], List[date]]
+RenderRequest = Union[date, Tuple[Optional[date], Optional[str], Optional[Selection]]]
+
+_registry: Dict[tuple, 'Datepicker'] = {}
+_registry_maxsize = 128
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+
+class _LazyViews(Mapping):
+    def __init__(self, factory: Callable[[str], BaseView], names: Iterable[str]):
+        self._factory = factory
+        self._names = tuple(names)
+        self._views: Dict[str, BaseView] = {}
+
+    def __getitem__(self, name: str) -> BaseView:
+        try:
+            return self._views[name]
+        except KeyError:
+            if name not in self._names:
+                raise
+        view = self._views[name] = self._factory(name)
+        return view
+
+    def __contains__(self, name) -> bool:
+        return name in self._names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
 
 
 class Datepicker:
-    datepicker_callback = CallbackData('datepicker', 'view', 'action', 'year', 'month', 'day')
+    datepicker_callback: DatepickerCallbackData = datepicker_callback
     ignore_callback = datepicker_callback.new('', 'ignore', -1, -1, -1)
 
-    def __init__(self, settings: DatepickerSettings = None):
+    locales: LocaleRegistry = locales
+
+    view_classes: Dict[str, Type[BaseView]] = {
+        'day': DayView,
+        'month': MonthView,
+        'year': YearView,
+        'time': TimeView,
+    }
+
+    def __init__(self, settings: DatepickerSettings = None, markup_cache: MarkupCache = None,
+                 coalescer: NavigationCoalescer = None, edit_scheduler: EditScheduler = None,
+                 serialize_markup: bool = False, observers: Iterable[DatepickerObserver] = (),
+                 session_store: SessionStore = None, profiler: DatepickerProfiler = None):
         if settings is None:
             settings = DatepickerSettings()
 
         self.settings = settings
+        self.coalescer = coalescer
+        self.edit_scheduler = edit_scheduler
+        self.serialize_markup = serialize_markup
+        self.observers = tuple(observers)
+        self.session_store = session_store
+        self.profiler = profiler
+        self.session_callback = SessionCallbackData(settings.callback_data.prefix, settings.callback_data.sep)
+        self.skipped_edits = 0
+        self.errors = 0
+
+        self._markup_cache = markup_cache
+        self._custom_actions = None
+        self.views = _LazyViews(self._create_view, self.view_classes)
+
+    @property
+    def custom_actions(self) -> Dict[str, DatepickerCustomAction]:
+        if self._custom_actions is None:
+            self._custom_actions = {
+                action.action: action(self.settings, self.set_view) for action in self.settings.custom_actions
+            }
+        return self._custom_actions
+
+    def _create_view(self, name: str) -> BaseView:
+        return self.view_classes[name](
+            self.settings, set_view=self.set_view, markup_cache=self._markup_cache, edit_markup=self.edit_markup,
+            serialize_markup=self.serialize_markup, observers=self.observers, custom_actions=self.custom_actions
+        )
 
-        self.views = {
-            'day': DayView(settings, set_view=self.set_view),
-            'month': MonthView(settings, set_view=self.set_view),
-            'year': YearView(settings, set_view=self.set_view),
-        }
+    @classmethod
+    def from_settings(cls, settings: DatepickerSettings = None, **kwargs) -> 'Datepicker':
+        if settings is None:
+            settings = DatepickerSettings()
+
+        key = (cls, settings, *sorted((name, _freeze(value)) for name, value in kwargs.items()))
+        datepicker = _registry.get(key)
+        if datepicker is None:
+            if len(_registry) >= _registry_maxsize:
+                del _registry[next(iter(_registry))]
+            datepicker = _registry[key] = cls(settings, **kwargs)
+
+        return datepicker
+
+    def start_calendar(self, serialized: bool = None,
+                       locale: str = None) -> Union[InlineKeyboardMarkup, SerializedMarkup]:
+        if serialized is None:
+            serialized = self.serialize_markup
+        with use_locale(self.locales.get(locale)):
+            return self._get_markup(self.views[self.settings.initial_view], self.settings.initial_date, serialized)
+
+    async def start_calendar_async(self, serialized: bool = None, locale: str = None,
+                                   data: Dict = None) -> Union[InlineKeyboardMarkup, SerializedMarkup]:
+        await self.views[self.settings.initial_view].prepare(self.settings.initial_date)
+        markup = self.start_calendar(serialized, locale)
+        if self.session_store is None:
+            return markup
+
+        session = DatepickerSession(data=data)
+        markup = self._bind_session(markup, session)
+        await self.session_store.set(session)
+        return markup
+
+    def _bind_session(self, markup: Union[InlineKeyboardMarkup, SerializedMarkup],
+                      session: DatepickerSession) -> Union[InlineKeyboardMarkup, SerializedMarkup]:
+        serialized = isinstance(markup, SerializedMarkup)
+        rows = json.loads(markup)['inline_keyboard'] if serialized else markup.inline_keyboard
+
+        ignore_callback = self.settings.ignore_callback
+        indexes = {}
+        for row in rows:
+            for button in row:
+                callback = (button if serialized else button.values).get('callback_data')
+                if callback is not None and callback != ignore_callback:
+                    indexes.setdefault(callback, len(indexes))
 
-    def start_calendar(self):
-        return self.views[self.settings.initial_view].get_markup(self.settings.initial_date)
+        callbacks = tuple(indexes)
+        if callbacks != session.callbacks:
+            session.previous = session.generation, session.callbacks
+            session.generation = (session.generation + 1) % 64
+            session.callbacks = callbacks
+
+        keyboard = []
+        for row in rows:
+            keyboard.append([])
+            for button in row:
+                values = button if serialized else button.values
+                index = indexes.get(values.get('callback_data'))
+                if index is not None:
+                    values = {**values, 'callback_data': self.session_callback.new(session.token, session.generation,
+                                                                                    index)}
+                    button = values if serialized else InlineKeyboardButton(**values)
+                keyboard[-1].append(button)
+
+        if serialized:
+            return SerializedMarkup(json.dumps({'inline_keyboard': keyboard}))
+        return InlineKeyboardMarkup(row_width=markup.row_width, inline_keyboard=keyboard)
+
+    def render_many(self, requests: Iterable[RenderRequest],
+                    serialized: bool = None) -> Iterator[Union[InlineKeyboardMarkup, SerializedMarkup]]:
+        if serialized is None:
+            serialized = self.serialize_markup
+
+        view = self.views[self.settings.initial_view]
+        markups = {}
+        rows: Dict[tuple, List[InlineKeyboardButton]] = {}
+
+        for request in requests:
+            if isinstance(request, date):
+                request = (request,)
+            _date, locale, selection = (*request, None, None)[:3]
+            if _date is None:
+                _date = self.settings.initial_date
+            locale = self.locales.get(locale)
+            kwargs = view.get_selection_kwargs(selection)
+
+            key = (_date, locale, *sorted(kwargs.items()))
+            markup = markups.get(key)
+            if markup is None:
+                with use_locale(locale):
+                    markup = markups[key] = self._get_markup(view, _date, serialized, **kwargs)
+                if not serialized:
+                    self._share_rows(markup, rows)
+            yield markup
+
+    @staticmethod
+    def _share_rows(markup: InlineKeyboardMarkup, rows: Dict[tuple, List[InlineKeyboardButton]]):
+        keyboard = markup.inline_keyboard
+        for i, row in enumerate(keyboard):
+            keyboard[i] = rows.setdefault(tuple((button.text, button.callback_data) for button in row), row)
 
     async def set_view(self, query: CallbackQuery, view: str, _data: date):
-        if view not in ['day', 'month', 'year']:
+        if view not in self.views:
             return False
-        return await query.message.edit_reply_markup(self.views[view].get_markup(_data))
+        await self.views[view].prepare(_data)
+        return await self.edit_markup(query, self._get_markup(self.views[view], _data, self.serialize_markup))
+
+    def _get_markup(self, view: BaseView, _date: date, serialized: bool,
+                    **kwargs) -> Union[InlineKeyboardMarkup, SerializedMarkup]:
+        if self.profiler is not None and self.profiler.sample():
+            return self.profiler.run_sync(('get_markup', view.name, ''), view.get_markup, _date, serialized, **kwargs)
+        return view.get_markup(_date, serialized, **kwargs)
+
+    async def edit_markup(self, query: CallbackQuery, markup: Union[InlineKeyboardMarkup, SerializedMarkup]):
+        if self.session_store is None:
+            return await self._edit_markup(query, markup)
+
+        session = current_session.get()
+        if session is None:
+            session = DatepickerSession()
+        state = session.generation, session.callbacks, session.previous
+        markup = self._bind_session(markup, session)
+        if session.generation == state[0]:
+            return await self._edit_markup(query, markup)
+
+        generation = session.generation
+        await self.session_store.set(session)
+        result = False
+        try:
+            result = await self._edit_markup(query, markup)
+        finally:
+            if result is False and session.generation == generation:
+                session.generation, session.callbacks, session.previous = state
+                await self.session_store.set(session)
+        return result
+
+    async def _edit_markup(self, query: CallbackQuery, markup: Union[InlineKeyboardMarkup, SerializedMarkup]):
+        if markup_digest(markup) == markup_digest(query.message.reply_markup):
+            return self._skip_edit()
+
+        started = perf_counter()
+        try:
+            if self.edit_scheduler is not None:
+                result = await self.edit_scheduler.edit(query, markup)
+            else:
+                result = await query.message.edit_reply_markup(markup)
+        except MessageNotModified:
+            return self._skip_edit()
+
+        if self.observers:
+            duration = perf_counter() - started
+            for observer in self.observers:
+                observer.on_edit(duration, False)
+
+        return result
+
+    def _skip_edit(self) -> bool:
+        self.skipped_edits += 1
+        for observer in self.observers:
+            observer.on_edit(0.0, True)
+        return False
+
+    @property
+    def callback_data(self) -> Union[CallbackData, CompactCallbackData]:
+        return self.settings.callback_data
+
+    async def process(self, query: CallbackQuery, data: Dict[str, str] = None,
+                      locale: str = None) -> Union[Selection, bool]:
+        if self.profiler is not None and self.profiler.sample():
+            return await self.profiler.run('process', self._dispatch(query, data, locale))
+        return await self._dispatch(query, data, locale)
+
+    async def _dispatch(self, query: CallbackQuery, data: Optional[Dict[str, str]],
+                        locale: Optional[str]) -> Union[Selection, bool]:
+        with use_locale(self.locales.get(locale)):
+            if data is None and self.session_store is not None and self.session_callback.match(query.data):
+                return await self._process_session(query)
+            return await self._process(query, data)
+
+    async def _process_session(self, query: CallbackQuery) -> Union[Selection, bool]:
+        try:
+            token, generation, index = self.session_callback.parse(query.data)
+        except ValueError:
+            await query.answer(cache_time=60)
+            return False
+
+        session = await self.session_store.get(token)
+        callbacks = session.get_callbacks(generation) if session is not None else ()
+        if index >= len(callbacks):
+            await query.answer()
+            return False
+
+        try:
+            data = self.settings.callback_data.parse(callbacks[index])
+        except ValueError:
+            await query.answer(cache_time=60)
+            return False
+
+        reset_token = current_session.set(session)
+        try:
+            result = await self._process(query, data)
+        finally:
+            current_session.reset(reset_token)
+
+        await self.session_store.set(session)
+        return result
+
+    async def _process(self, query: CallbackQuery, data: Dict[str, str] = None) -> Union[Selection, bool]:
+        if data is None:
+            try:
+                data = self.settings.callback_data.parse(query.data)
+            except ValueError:
+                await query.answer(cache_time=60)
+                return False
 
-    async def process(self, query: CallbackQuery, data: CallbackData) -> date:
         action = data['action']
 
         view = data['view']
@@ -39,11 +337,29 @@ class Datepicker:
             await query.answer(cache_time=60)
             return False
 
-        _date = datetime(int(data['year']), int(data['month']), int(data['day'])).date()
+        if self.profiler is not None:
+            custom_action = self.custom_actions.get(action)
+            self.profiler.tag(view, action if custom_action is None else custom_action.__class__.__qualname__)
+
+        if self.coalescer is not None and action in self.coalescer.actions and not await self.coalescer.wait(query):
+            await query.answer()
+            return False
 
+        started = perf_counter()
         try:
-            return await self.views[view].process(query, action, _date)
-        except:
+            _date = datetime(int(data['year']), int(data['month']), int(data['day'])).date()
+            result = await self.views[view].process(query, action, _date, data.get('extra', ''))
+        except Exception as e:
+            self.errors += 1
+            logger.exception('Error while processing datepicker callback %s:%s', view, action)
+            for observer in self.observers:
+                observer.on_error(view, action, e)
             await query.answer(cache_time=60)
+            return False
 
-        return False
+        if self.observers:
+            duration = perf_counter() - started
+            for observer in self.observers:
+                observer.on_process(view, action, duration, result)
+
+        return result
@@ -0,0 +1,40 @@
+import calendar
+from array import array
+from datetime import date
+from typing import Dict, Tuple
+
+
+class MonthGrid:
+    def __init__(self):
+        self._grids: Dict[Tuple[int, int, int], array] = {}
+
+    @staticmethod
+    def _build(year: int, month: int, firstweekday: int) -> array:
+        offset = (date(year, month, 1).weekday() - firstweekday) % 7
+        days = calendar.monthrange(year, month)[1]
+
+        cells = array('B', bytes(offset))
+        cells.extend(range(1, days + 1))
+        cells.extend(bytes(-len(cells) % 7))
+        return cells
+
+    def get(self, year: int, month: int, firstweekday: int = 0) -> array:
+        key = (year, month, firstweekday)
+        grid = self._grids.get(key)
+        if grid is None:
+            grid = self._grids[key] = self._build(year, month, firstweekday)
+        return grid
+
+    def prefill(self, start_year: int, end_year: int, firstweekday: int = 0):
+        for year in range(start_year, end_year + 1):
+            for month in range(1, 13):
+                self.get(year, month, firstweekday)
+
+    def clear(self):
+        self._grids.clear()
+
+    def __len__(self):
+        return len(self._grids)
+
+
+month_grid = MonthGrid()
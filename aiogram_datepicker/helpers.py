@@ -1,6 +1,46 @@
+import calendar
+import json
+from datetime import date, time
+from typing import Union
+
+from aiogram.types import InlineKeyboardMarkup
+
+
 def merge_list(lst, res=None):
     if res is None:
         res = []
     for el in lst:
-        merge_list(el, res) if isinstance(el, list) else res.append(el)
+        merge_list(el, res) if isinstance(el, (list, tuple)) else res.append(el)
     return res
+
+
+def freeze_list(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_list(el) for el in value)
+    return value
+
+
+def shift_month(_date: date, months: int) -> date:
+    year, month = divmod(_date.year * 12 + _date.month - 1 + months, 12)
+    month += 1
+    return date(year, month, min(_date.day, calendar.monthrange(year, month)[1]))
+
+
+def shift_year(_date: date, years: int) -> date:
+    return shift_month(_date, years * 12)
+
+
+def parse_minutes(value: Union[str, time]) -> int:
+    if isinstance(value, time):
+        return value.hour * 60 + value.minute
+    hours, _, minutes = value.partition(':')
+    return int(hours) * 60 + int(minutes or 0)
+
+
+def markup_digest(markup: InlineKeyboardMarkup) -> int:
+    if markup is None:
+        return 0
+    if isinstance(markup, str):
+        return hash(tuple(tuple((button['text'], button.get('callback_data')) for button in row)
+                          for row in json.loads(markup)['inline_keyboard']))
+    return hash(tuple(tuple((button.text, button.callback_data) for button in row) for row in markup.inline_keyboard))
@@ -0,0 +1,151 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from hashlib import sha1
+from sys import intern
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+
+class DatepickerLocale:
+    def __init__(self, code: str, month_names: Iterable[str], months_labels: Iterable[str],
+                 weekdays_labels: Iterable[str], labels: Dict[str, str] = None):
+        self.code = code.lower().replace('_', '-')
+        self.month_names = tuple(intern(name) for name in month_names)
+        self.months_labels = tuple(intern(label) for label in months_labels)
+        self.weekdays_labels = tuple(intern(label) for label in weekdays_labels)
+        self.labels = MappingProxyType({action: intern(label) for action, label in (labels or {}).items()})
+
+        if len(self.month_names) != 12 or len(self.months_labels) != 12:
+            raise ValueError(f'{self.code} -> should be 12 month names and labels')
+        if len(self.weekdays_labels) != 7:
+            raise ValueError(f'{self.code} -> weekdays_labels -> should be 7 weekdays labels')
+
+        self.fingerprint = sha1(repr((self.code, self.month_names, self.months_labels, self.weekdays_labels,
+                                      sorted(self.labels.items()))).encode()).hexdigest()[:16]
+
+
+class LocaleRegistry:
+    def __init__(self, locales: Iterable[DatepickerLocale] = ()):
+        self._locales: Dict[str, DatepickerLocale] = {}
+        self._resolved: Dict[str, Optional[DatepickerLocale]] = {}
+        for locale in locales:
+            self.register(locale)
+
+    def register(self, locale: DatepickerLocale):
+        self._locales[locale.code] = locale
+        self._resolved.clear()
+
+    def get(self, code: Optional[str]) -> Optional[DatepickerLocale]:
+        if not code:
+            return None
+
+        try:
+            return self._resolved[code]
+        except KeyError:
+            pass
+
+        normalized = code.lower().replace('_', '-')
+        locale = self._locales.get(normalized) or self._locales.get(normalized.partition('-')[0])
+        self._resolved[code] = locale
+        return locale
+
+    def __contains__(self, code: str) -> bool:
+        return self.get(code) is not None
+
+
+class LocaleTable:
+    __slots__ = ('labels', 'weekdays_labels', 'months_labels', 'days_titles')
+
+    def __init__(self, labels: Mapping[str, str], weekdays_labels: Tuple[str, ...], months_labels: Tuple[str, ...],
+                 days_titles: Tuple[str, ...]):
+        self.labels = labels
+        self.weekdays_labels = weekdays_labels
+        self.months_labels = months_labels
+        self.days_titles = days_titles
+
+
+class LocaleTables:
+    def __init__(self, views: Mapping[str, Mapping], labels: Mapping[str, str], custom_labels: Iterable[str] = (),
+                 custom_view_labels: Iterable[str] = ()):
+        self._views = views
+        self._labels = labels
+        self._custom_labels = frozenset(custom_labels)
+        self._custom_view_labels = frozenset(custom_view_labels)
+        self._tables: Dict[Optional[DatepickerLocale], LocaleTable] = {}
+
+    def get(self, locale: Optional[DatepickerLocale]) -> LocaleTable:
+        table = self._tables.get(locale)
+        if table is None:
+            table = self._tables[locale] = self._build(locale)
+        return table
+
+    def _build(self, locale: Optional[DatepickerLocale]) -> LocaleTable:
+        if locale is None:
+            locale = default_locale
+            labels = self._labels
+            weekdays_labels = self._views['day']['weekdays_labels']
+            months_labels = self._views['month']['months_labels']
+        else:
+            labels = MappingProxyType({
+                **self._labels,
+                **{key: value for key, value in locale.labels.items() if key not in self._custom_labels}
+            })
+            weekdays_labels = self._views['day']['weekdays_labels'] \
+                if 'weekdays_labels' in self._custom_view_labels else locale.weekdays_labels
+            months_labels = self._views['month']['months_labels'] \
+                if 'months_labels' in self._custom_view_labels else locale.months_labels
+
+        first_weekday = self._views['day']['first_weekday']
+        weekdays_labels = tuple(intern(label) for label in weekdays_labels)
+        return LocaleTable(
+            labels=labels,
+            weekdays_labels=weekdays_labels[first_weekday:] + weekdays_labels[:first_weekday],
+            months_labels=tuple(intern(label) for label in months_labels),
+            days_titles=('',) + tuple(intern(labels['days-title'].replace('{month}', name))
+                                      for name in locale.month_names),
+        )
+
+
+default_locale = DatepickerLocale(
+    'en',
+    month_names=['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October',
+                 'November', 'December'],
+    months_labels=['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'],
+    weekdays_labels=['Mo', 'Tu', 'We', 'Th', 'Fr', 'Sa', 'Su'],
+    labels={'select': 'Select'},
+)
+
+locales = LocaleRegistry([
+    default_locale,
+    DatepickerLocale(
+        'ru',
+        month_names=['Январь', 'Февраль', 'Март', 'Апрель', 'Май', 'Июнь', 'Июль', 'Август', 'Сентябрь', 'Октябрь',
+                     'Ноябрь', 'Декабрь'],
+        months_labels=['Янв', 'Фев', 'Мар', 'Апр', 'Май', 'Июн', 'Июл', 'Авг', 'Сен', 'Окт', 'Ноя', 'Дек'],
+        weekdays_labels=['Пн', 'Вт', 'Ср', 'Чт', 'Пт', 'Сб', 'Вс'],
+        labels={'select': 'Выбрать'},
+    ),
+    DatepickerLocale(
+        'uk',
+        month_names=['Січень', 'Лютий', 'Березень', 'Квітень', 'Травень', 'Червень', 'Липень', 'Серпень', 'Вересень',
+                     'Жовтень', 'Листопад', 'Грудень'],
+        months_labels=['Січ', 'Лют', 'Бер', 'Кві', 'Тра', 'Чер', 'Лип', 'Сер', 'Вер', 'Жов', 'Лис', 'Гру'],
+        weekdays_labels=['Пн', 'Вт', 'Ср', 'Чт', 'Пт', 'Сб', 'Нд'],
+        labels={'select': 'Обрати'},
+    ),
+])
+
+current_locale: ContextVar[Optional[DatepickerLocale]] = ContextVar('datepicker_locale', default=None)
+
+
+@contextmanager
+def use_locale(locale: Optional[DatepickerLocale]):
+    if locale is None:
+        yield
+        return
+
+    token = current_locale.set(locale)
+    try:
+        yield
+    finally:
+        current_locale.reset(token)
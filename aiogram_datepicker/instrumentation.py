@@ -0,0 +1,125 @@
+from bisect import bisect_left
+from datetime import date
+from typing import Dict, Tuple, Union
+
+default_buckets = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class DatepickerObserver:
+    def on_render(self, view: str, duration: float, cached: bool):
+        pass
+
+    def on_process(self, view: str, action: str, duration: float, result: Union[date, bool]):
+        pass
+
+    def on_edit(self, duration: float, skipped: bool):
+        pass
+
+    def on_error(self, view: str, action: str, exception: BaseException):
+        pass
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.values: Dict[tuple, float] = {}
+
+    def inc(self, *labels, value: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + value
+
+    def get(self, *labels) -> float:
+        return self.values.get(labels, 0)
+
+    def export(self) -> str:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        for labels, value in self.values.items():
+            lines.append(f'{self.name}{_format_labels(self.labels, labels)} {value}')
+        return '\n'.join(lines)
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = default_buckets):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        self.values: Dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels):
+        counts = self.values.get(labels)
+        if counts is None:
+            counts = self.values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def count(self, *labels) -> int:
+        counts = self.values.get(labels)
+        return sum(counts[:-1]) if counts else 0
+
+    def export(self) -> str:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        for labels, counts in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{self.name}_bucket{_format_labels(self.labels + ("le",), labels + (le,))} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labels, labels)} {counts[-1]}')
+            lines.append(f'{self.name}_count{_format_labels(self.labels, labels)} {cumulative}')
+        return '\n'.join(lines)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+
+class MetricsCollector(DatepickerObserver):
+    def __init__(self, prefix: str = 'datepicker', buckets: Tuple[float, ...] = default_buckets):
+        self.render_seconds = Histogram(f'{prefix}_render_seconds', 'Time spent rendering keyboards.',
+                                        ('view',), buckets)
+        self.renders = Counter(f'{prefix}_renders_total', 'Rendered keyboards by markup cache outcome.',
+                               ('view', 'cache'))
+        self.process_seconds = Histogram(f'{prefix}_process_seconds', 'Time spent processing callbacks.',
+                                         ('view', 'action'), buckets)
+        self.processed = Counter(f'{prefix}_processed_total', 'Processed callbacks by outcome.',
+                                 ('view', 'action', 'outcome'))
+        self.edit_seconds = Histogram(f'{prefix}_edit_seconds', 'Bot API latency of keyboard edits.', (), buckets)
+        self.edits = Counter(f'{prefix}_edits_total', 'Keyboard edits by outcome.', ('outcome',))
+        self.errors = Counter(f'{prefix}_errors_total', 'Exceptions raised while processing callbacks.',
+                              ('view', 'action', 'exception'))
+
+    @property
+    def metrics(self) -> tuple:
+        return (self.render_seconds, self.renders, self.process_seconds, self.processed, self.edit_seconds,
+                self.edits, self.errors)
+
+    def on_render(self, view: str, duration: float, cached: bool):
+        self.render_seconds.observe(duration, view)
+        self.renders.inc(view, 'hit' if cached else 'miss')
+
+    def on_process(self, view: str, action: str, duration: float, result: Union[date, bool]):
+        self.process_seconds.observe(duration, view, action)
+        self.processed.inc(view, action, 'selected' if result else 'ok')
+
+    def on_edit(self, duration: float, skipped: bool):
+        if skipped:
+            self.edits.inc('skipped')
+        else:
+            self.edit_seconds.observe(duration)
+            self.edits.inc('sent')
+
+    def on_error(self, view: str, action: str, exception: BaseException):
+        self.errors.inc(view, action, exception.__class__.__name__)
+
+    def export_prometheus(self) -> str:
+        return '\n'.join(metric.export() for metric in self.metrics if metric.values) + '\n'
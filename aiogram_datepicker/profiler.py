@@ -0,0 +1,214 @@
+import cProfile
+import logging
+import os
+import pstats
+import re
+import time
+import tracemalloc
+from contextvars import ContextVar
+from random import random
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+ProfileKey = Tuple[str, str, str]
+
+_unsafe_chars = re.compile(r'[^A-Za-z0-9_.-]+')
+
+
+class _Sample:
+    __slots__ = ('key', 'top', 'profile', 'trace_allocations', 'allocations', 'failed')
+
+    def __init__(self, key: ProfileKey, trace_allocations: bool, top: int):
+        self.key = key
+        self.top = top
+        self.profile = cProfile.Profile()
+        self.trace_allocations = trace_allocations and not tracemalloc.is_tracing()
+        self.allocations: Dict[Tuple[str, int], List[int]] = {}
+        self.failed = False
+
+    def resume(self):
+        if self.failed:
+            return
+        if self.trace_allocations:
+            tracemalloc.start()
+        try:
+            self.profile.enable()
+        except ValueError:
+            self.failed = True
+            if self.trace_allocations:
+                tracemalloc.stop()
+
+    def pause(self):
+        if self.failed:
+            return
+        self.profile.disable()
+        if not self.trace_allocations:
+            return
+
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        snapshot = snapshot.filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),
+                                           tracemalloc.Filter(False, __file__)))
+        for stat in snapshot.statistics('lineno')[:self.top * 4]:
+            frame = stat.traceback[0]
+            entry = self.allocations.setdefault((frame.filename, frame.lineno), [0, 0])
+            entry[0] += stat.size
+            entry[1] += stat.count
+
+
+class _SampledCoroutine:
+    __slots__ = ('coroutine', 'sample')
+
+    def __init__(self, coroutine: Awaitable[T], sample: _Sample):
+        self.coroutine = coroutine
+        self.sample = sample
+
+    def __await__(self):
+        iterator = self.coroutine.__await__()
+        value, error = None, None
+        while True:
+            self.sample.resume()
+            try:
+                if error is not None:
+                    future = iterator.throw(error)
+                else:
+                    future = iterator.send(value)
+            except StopIteration as e:
+                return e.value
+            finally:
+                self.sample.pause()
+
+            try:
+                value, error = (yield future), None
+            except GeneratorExit:
+                iterator.close()
+                raise
+            except BaseException as e:
+                value, error = None, e
+
+
+_current_sample: ContextVar[Optional[_Sample]] = ContextVar('datepicker_profile_sample', default=None)
+
+
+class DatepickerProfiler:
+    def __init__(self, directory: str, sample_rate: float = 0.01, interval: float = 300, top: int = 25,
+                 trace_allocations: bool = True, clock: Callable[[], float] = time.monotonic):
+        if not 0 < sample_rate <= 1:
+            raise ValueError('sample_rate should be greater than 0 and not greater than 1')
+        if interval <= 0:
+            raise ValueError('interval should be positive')
+        if top <= 0:
+            raise ValueError('top should be positive')
+
+        os.makedirs(directory, exist_ok=True)
+
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.top = top
+        self.trace_allocations = trace_allocations
+        self.clock = clock
+        self.samples = 0
+        self.dumps = 0
+
+        self._active = False
+        self._last_dump = clock()
+        self._counts: Dict[ProfileKey, int] = {}
+        self._stats: Dict[ProfileKey, pstats.Stats] = {}
+        self._allocations: Dict[ProfileKey, Dict[Tuple[str, int], List[int]]] = {}
+
+    def sample(self) -> bool:
+        return not self._active and random() < self.sample_rate
+
+    @staticmethod
+    def tag(view: str, action: str = ''):
+        sample = _current_sample.get()
+        if sample is not None:
+            sample.key = sample.key[0], view, action
+
+    def _finish(self, sample: _Sample):
+        self._active = False
+        if not sample.failed:
+            self._record(sample)
+        if self.clock() - self._last_dump >= self.interval:
+            self.dump()
+
+    async def run(self, kind: str, coroutine: Awaitable[T]) -> T:
+        self._active = True
+        sample = _Sample((kind, '', ''), self.trace_allocations, self.top)
+        token = _current_sample.set(sample)
+        try:
+            return await _SampledCoroutine(coroutine, sample)
+        finally:
+            _current_sample.reset(token)
+            self._finish(sample)
+
+    def run_sync(self, key: ProfileKey, function: Callable[..., T], *args, **kwargs) -> T:
+        self._active = True
+        sample = _Sample(key, self.trace_allocations, self.top)
+        sample.resume()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            sample.pause()
+            self._finish(sample)
+
+    def _record(self, sample: _Sample):
+        key = sample.key
+        self.samples += 1
+        self._counts[key] = self._counts.get(key, 0) + 1
+
+        stats = self._stats.get(key)
+        if stats is None:
+            self._stats[key] = pstats.Stats(sample.profile)
+        else:
+            stats.add(sample.profile)
+
+        if not sample.allocations:
+            return
+
+        allocations = self._allocations.setdefault(key, {})
+        for location, (size, count) in sample.allocations.items():
+            entry = allocations.setdefault(location, [0, 0])
+            entry[0] += size
+            entry[1] += count
+
+    def dump(self) -> List[str]:
+        self._last_dump = self.clock()
+        if not self._stats:
+            return []
+
+        prefix = os.path.join(self.directory, f'{time.strftime("%Y%m%d-%H%M%S")}-{self.dumps:04}')
+        paths = []
+        try:
+            for key, stats in self._stats.items():
+                name = '-'.join(_unsafe_chars.sub('_', part) for part in key if part)
+                paths.append(f'{prefix}-{name}.pstats')
+                stats.dump_stats(paths[-1])
+
+            if self._allocations:
+                paths.append(f'{prefix}-allocations.txt')
+                with open(paths[-1], 'w') as f:
+                    f.write(self._format_allocations())
+        except OSError:
+            logger.exception('Failed to dump datepicker profile to %s', self.directory)
+
+        self.dumps += 1
+        self._counts.clear()
+        self._stats.clear()
+        self._allocations.clear()
+        return paths
+
+    def _format_allocations(self) -> str:
+        lines = []
+        for key, allocations in self._allocations.items():
+            samples = self._counts[key]
+            lines.append(f'{" ".join(part for part in key if part)}: {samples} samples')
+            top = sorted(allocations.items(), key=lambda item: item[1][0], reverse=True)[:self.top]
+            for (filename, lineno), (size, count) in top:
+                lines.append(f'  {size / samples / 1024:.1f} KiB in {count / samples:.1f} blocks per call: '
+                             f'{filename}:{lineno}')
+            lines.append('')
+        return '\n'.join(lines)
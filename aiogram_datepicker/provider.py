@@ -0,0 +1,116 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from hashlib import sha1
+from time import monotonic
+from typing import Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+MonthLabels = Dict[int, str]
+
+
+class AvailabilityProvider(ABC):
+    @abstractmethod
+    async def get_month(self, year: int, month: int) -> MonthLabels:
+        pass
+
+
+class _Entry:
+    __slots__ = ('labels', 'expires', 'digest')
+
+    def __init__(self, labels: MonthLabels, expires: float):
+        self.labels = labels
+        self.expires = expires
+        self.digest = int.from_bytes(sha1(repr(sorted(labels.items())).encode()).digest()[:8], 'big')
+
+
+class CachedAvailabilityProvider:
+    def __init__(self, provider: AvailabilityProvider, ttl: float = 60, maxsize: int = 256, prefetch: bool = True):
+        if ttl <= 0 or maxsize <= 0:
+            raise ValueError('ttl and maxsize should be positive')
+
+        self.provider = provider
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.prefetch_enabled = prefetch
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: Dict[Tuple[int, int], _Entry] = OrderedDict()
+        self._pending: Dict[Tuple[int, int], asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _get_entry(self, key: Tuple[int, int]) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires < monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def peek(self, year: int, month: int) -> Optional[MonthLabels]:
+        entry = self._get_entry((year, month))
+        return entry.labels if entry is not None else None
+
+    def token(self, year: int, month: int) -> int:
+        entry = self._get_entry((year, month))
+        return entry.digest if entry is not None else 0
+
+    async def load(self, year: int, month: int) -> MonthLabels:
+        key = (year, month)
+
+        entry = self._get_entry(key)
+        if entry is not None:
+            self.hits += 1
+            return entry.labels
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            pending = self._pending[key] = asyncio.ensure_future(self._fetch(key))
+            pending.add_done_callback(self._on_fetched)
+        return await asyncio.shield(pending)
+
+    async def _fetch(self, key: Tuple[int, int]) -> MonthLabels:
+        try:
+            labels = await self.provider.get_month(*key)
+        finally:
+            del self._pending[key]
+
+        self._entries[key] = _Entry(labels, monotonic() + self.ttl)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+        return labels
+
+    @staticmethod
+    def _on_fetched(task: asyncio.Task):
+        if not task.cancelled():
+            task.exception()
+
+    def prefetch(self, year: int, month: int):
+        key = (year, month)
+        if key in self._pending or self._get_entry(key) is not None:
+            return
+
+        task = asyncio.ensure_future(self.load(year, month))
+        self._tasks.add(task)
+        task.add_done_callback(self._on_prefetched)
+
+    def _on_prefetched(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning('Failed to prefetch datepicker availability', exc_info=task.exception())
+
+    def invalidate(self, year: int = None, month: int = None):
+        if year is None:
+            self._entries.clear()
+        else:
+            self._entries.pop((year, month), None)
@@ -0,0 +1,68 @@
+from typing import Dict, Iterator, Optional, Union
+
+from aiogram import types
+from aiogram.dispatcher.filters import Filter
+
+from .datepicker import Datepicker, Selection
+
+
+class DatepickerRouter:
+    def __init__(self, *datepickers: Datepicker, sep: str = ':'):
+        self.sep = sep
+        self._datepickers: Dict[str, Datepicker] = {}
+        for datepicker in datepickers:
+            self.register(datepicker)
+
+    def register(self, datepicker: Datepicker) -> Datepicker:
+        namespace = datepicker.callback_data.prefix
+        registered = self._datepickers.get(namespace)
+        if registered is not None and registered is not datepicker:
+            raise ValueError(f'namespace {namespace} is already registered')
+
+        self._datepickers[namespace] = datepicker
+        return datepicker
+
+    def unregister(self, namespace: str):
+        self._datepickers.pop(namespace, None)
+
+    def resolve(self, callback_data: Optional[str]) -> Optional[Datepicker]:
+        if not callback_data:
+            return None
+        return self._datepickers.get(callback_data.partition(self.sep)[0])
+
+    async def process(self, query: types.CallbackQuery,
+                      locale: str = None) -> Union[Selection, bool]:
+        datepicker = self.resolve(query.data)
+        if datepicker is None:
+            return False
+        return await datepicker.process(query, locale=locale)
+
+    def filter(self) -> 'DatepickerRouterFilter':
+        return DatepickerRouterFilter(self)
+
+    def __getitem__(self, namespace: str) -> Datepicker:
+        return self._datepickers[namespace]
+
+    def __contains__(self, namespace: str) -> bool:
+        return namespace in self._datepickers
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._datepickers)
+
+    def __len__(self):
+        return len(self._datepickers)
+
+
+class DatepickerRouterFilter(Filter):
+    def __init__(self, router: DatepickerRouter):
+        self.router = router
+
+    @classmethod
+    def validate(cls, full_config):
+        raise ValueError("That filter can't be used in filters factory!")
+
+    async def check(self, query: types.CallbackQuery):
+        datepicker = self.router.resolve(query.data)
+        if datepicker is None:
+            return False
+        return {'datepicker': datepicker}
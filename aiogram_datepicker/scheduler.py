@@ -0,0 +1,109 @@
+import asyncio
+from time import monotonic
+from typing import Dict, Tuple
+
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup
+from aiogram.utils.exceptions import RetryAfter
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = 1):
+        if rate <= 0 or capacity < 1:
+            raise ValueError('rate should be positive and capacity at least 1')
+
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def delay(self, now: float = None) -> float:
+        if now is None:
+            now = monotonic()
+        self._refill(now)
+
+        delay = max(0.0, self.blocked_until - now)
+        if self.tokens < 1:
+            delay = max(delay, (1 - self.tokens) / self.rate)
+        return delay
+
+    def consume(self):
+        self.tokens -= 1
+
+    def block(self, seconds: float):
+        self.blocked_until = max(self.blocked_until, monotonic() + seconds)
+
+    @property
+    def idle(self) -> bool:
+        self._refill(monotonic())
+        return self.tokens >= self.capacity and self.blocked_until <= self.updated
+
+
+class EditScheduler:
+    def __init__(self, rate: float = 30, chat_rate: float = 1, group_rate: float = 20 / 60, chat_burst: float = 3,
+                 timeout: float = 15, max_chats: int = 10000):
+        self.chat_rate = chat_rate
+        self.group_rate = group_rate
+        self.chat_burst = chat_burst
+        self.timeout = timeout
+        self.max_chats = max_chats
+
+        self.queue_depth = 0
+        self.sent = 0
+        self.dropped = 0
+        self.retries = 0
+
+        self._global = TokenBucket(rate, rate)
+        self._chats: Dict[int, TokenBucket] = {}
+        self._generations: Dict[Tuple[int, int], int] = {}
+
+    def _get_chat_bucket(self, chat) -> TokenBucket:
+        bucket = self._chats.get(chat.id)
+        if bucket is None:
+            if len(self._chats) >= self.max_chats:
+                self._chats = {chat_id: bucket for chat_id, bucket in self._chats.items() if not bucket.idle}
+
+            rate = self.group_rate if chat.type in ('group', 'supergroup') else self.chat_rate
+            bucket = self._chats[chat.id] = TokenBucket(rate, min(self.chat_burst, max(1.0, rate)))
+        return bucket
+
+    async def edit(self, query: CallbackQuery, markup: InlineKeyboardMarkup):
+        message = query.message
+        key = (message.chat.id, message.message_id)
+        generation = self._generations[key] = self._generations.get(key, 0) + 1
+        deadline = monotonic() + self.timeout
+
+        self.queue_depth += 1
+        try:
+            while True:
+                now = monotonic()
+                if self._generations.get(key) != generation or now > deadline:
+                    self.dropped += 1
+                    return False
+
+                chat_bucket = self._get_chat_bucket(message.chat)
+                delay = max(self._global.delay(now), chat_bucket.delay(now))
+                if delay > 0:
+                    await asyncio.sleep(min(delay, max(0.0, deadline - now) + 0.001))
+                    continue
+
+                self._global.consume()
+                chat_bucket.consume()
+                try:
+                    result = await message.edit_reply_markup(markup)
+                except RetryAfter as e:
+                    self.retries += 1
+                    chat_bucket.block(e.timeout)
+                    continue
+
+                self.sent += 1
+                return result
+        finally:
+            self.queue_depth -= 1
+            if self._generations.get(key) == generation:
+                del self._generations[key]
@@ -0,0 +1,167 @@
+from abc import ABC, abstractmethod
+from base64 import urlsafe_b64encode
+from collections import OrderedDict
+from contextvars import ContextVar
+from secrets import token_bytes
+from time import monotonic
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from aiogram.dispatcher.storage import BaseStorage
+
+from .callback_data import _alphabet, _alphabet_index
+
+_session_marker = '~'
+_token_size = 8
+_max_callbacks = len(_alphabet) ** 2
+
+
+def new_token() -> str:
+    return urlsafe_b64encode(token_bytes(_token_size * 3 // 4)).decode()
+
+
+class DatepickerSession:
+    __slots__ = ('token', 'generation', 'callbacks', 'previous', 'data')
+
+    def __init__(self, token: str = None, generation: int = 0, callbacks: Tuple[str, ...] = (),
+                 data: Dict[str, Any] = None, previous: Tuple[int, Tuple[str, ...]] = (-1, ())):
+        self.token = token if token is not None else new_token()
+        self.generation = generation
+        self.callbacks = tuple(callbacks)
+        self.previous = previous[0], tuple(previous[1])
+        self.data = data if data is not None else {}
+
+    def get_callbacks(self, generation: int) -> Tuple[str, ...]:
+        if generation == self.generation:
+            return self.callbacks
+        if generation == self.previous[0]:
+            return self.previous[1]
+        return ()
+
+    def to_python(self) -> Dict[str, Any]:
+        return {'generation': self.generation, 'callbacks': list(self.callbacks),
+                'previous': [self.previous[0], list(self.previous[1])], 'data': self.data}
+
+    @classmethod
+    def to_object(cls, token: str, value: Dict[str, Any]) -> 'DatepickerSession':
+        return cls(token, value['generation'], value['callbacks'], value['data'], value.get('previous', (-1, ())))
+
+
+current_session: ContextVar[Optional[DatepickerSession]] = ContextVar('datepicker_session', default=None)
+
+
+class SessionCallbackData:
+    def __init__(self, prefix: str, sep: str = ':'):
+        self.prefix = prefix
+        self.sep = sep
+        self._head = prefix + sep + _session_marker
+
+    def new(self, token: str, generation: int, index: int) -> str:
+        if index >= _max_callbacks:
+            raise ValueError('Too many callbacks in one keyboard!')
+        return self._head + token + _alphabet[generation] + _alphabet[index >> 6] + _alphabet[index & 63]
+
+    def match(self, callback_data: Optional[str]) -> bool:
+        return callback_data is not None and callback_data.startswith(self._head)
+
+    def parse(self, callback_data: str) -> Tuple[str, int, int]:
+        body = callback_data[len(self._head):]
+        if not callback_data.startswith(self._head) or len(body) != _token_size + 3:
+            raise ValueError("Passed callback data can't be parsed as a datepicker session.")
+
+        index = _alphabet_index
+        try:
+            return body[:_token_size], index[body[-3]], index[body[-2]] << 6 | index[body[-1]]
+        except KeyError:
+            raise ValueError('Invalid callback data!')
+
+
+class SessionStore(ABC):
+    @abstractmethod
+    async def get(self, token: str) -> Optional[DatepickerSession]:
+        pass
+
+    @abstractmethod
+    async def set(self, session: DatepickerSession):
+        pass
+
+    @abstractmethod
+    async def delete(self, token: str):
+        pass
+
+    async def close(self):
+        pass
+
+
+class MemorySessionStore(SessionStore):
+    def __init__(self, maxsize: int = 10000, ttl: float = 24 * 60 * 60, clock: Callable[[], float] = monotonic):
+        if maxsize <= 0:
+            raise ValueError('maxsize should be positive')
+        if ttl <= 0:
+            raise ValueError('ttl should be positive')
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.evictions = 0
+        self.expirations = 0
+
+        self._data: OrderedDict[str, Tuple[float, DatepickerSession]] = OrderedDict()
+
+    def _expire(self, now: float):
+        while self._data:
+            expires, _ = next(iter(self._data.values()))
+            if expires > now:
+                break
+            self._data.popitem(last=False)
+            self.expirations += 1
+
+    async def get(self, token: str) -> Optional[DatepickerSession]:
+        now = self.clock()
+        self._expire(now)
+
+        entry = self._data.get(token)
+        if entry is None:
+            return None
+        self._data[token] = now + self.ttl, entry[1]
+        self._data.move_to_end(token)
+        return entry[1]
+
+    async def set(self, session: DatepickerSession):
+        now = self.clock()
+        self._expire(now)
+
+        self._data[session.token] = now + self.ttl, session
+        self._data.move_to_end(session.token)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, token: str):
+        self._data.pop(token, None)
+
+    async def close(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class AiogramSessionStore(SessionStore):
+    def __init__(self, storage: BaseStorage, prefix: str = 'datepicker-session'):
+        self.storage = storage
+        self.prefix = prefix
+
+    def _address(self, token: str) -> str:
+        return f'{self.prefix}:{token}'
+
+    async def get(self, token: str) -> Optional[DatepickerSession]:
+        value = await self.storage.get_data(chat=self._address(token))
+        if not value:
+            return None
+        return DatepickerSession.to_object(token, value)
+
+    async def set(self, session: DatepickerSession):
+        await self.storage.set_data(chat=self._address(session.token), data=session.to_python())
+
+    async def delete(self, token: str):
+        await self.storage.reset_data(chat=self._address(token))
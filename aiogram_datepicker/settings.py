@@ -1,15 +1,31 @@
 from datetime import datetime, date
-from typing import Union, List, Dict
+from hashlib import sha1
+from types import MappingProxyType
+from typing import Union, List, Dict, Iterable, Type
 
+from .buttons import ButtonPool
+from .availability import Availability, DateRange, DatetimeRange, DisabledDates, IntervalSet, OccupiedSlots
+from .callback_data import (datepicker_callback, compact_datepicker_callback, DatepickerCallbackData,
+                            CompactCallbackData)
 from .custom_action import DatepickerCustomAction
-from .helpers import merge_list
+from .helpers import merge_list, freeze_list, parse_minutes
+from .i18n import LocaleTables
+from .provider import AvailabilityProvider, CachedAvailabilityProvider
 
-_available_views = ('day', 'month', 'year')
+_available_views = ('day', 'month', 'year', 'time')
+
+_internal_actions = ('set-day', 'set-month', 'set-year', 'set-time', 'set-view')
+
+_selection_modes = ('single', 'range', 'datetime', 'multi')
 
 _default_views = {
     'day': {
         'weekdays_labels': ['Mo', 'Tu', 'We', 'Th', 'Fr', 'Sa', 'Su'],
 
+        'first_weekday': 0,
+
+        'selection': 'single',
+
         'header': ['prev-year', 'days-title', 'next-year'],
 
         'show_weekdays': True,
@@ -27,6 +43,21 @@ _default_views = {
         'header': [],
 
         'footer': ['prev-years', 'next-years']
+    },
+    'time': {
+        'start': '09:00',
+
+        'end': '18:00',
+
+        'step': 30,
+
+        'columns': 4,
+
+        'disable_past': True,
+
+        'header': ['prev-day', 'time-title', 'next-day'],
+
+        'footer': []
     }
 }
 
@@ -40,31 +71,123 @@ _default_labels = {
     'selected-day': '{day} *',
     'selected-month': '{month} *',
     'present-day': '• {day} •',
+    'range-day': '{day} ~',
     'prev-month': '<',
     'select': 'Select',
     'next-month': '>',
+    'disabled-day': '×',
+    'disabled-month': '×',
+    'disabled-year': '×',
+    'prev-day': '<',
+    'next-day': '>',
+    'time-title': '{date}',
+    'time-slot': '{time}',
+    'occupied-slot': '×',
     'ignore': ''
 }
 
+_default_actions = frozenset(_default_labels)
+
 
 class DatepickerSettings:
-    def __init__(self, initial_date: date = datetime.now().date(), initial_view: str = 'day',
+    __slots__ = ('available_actions', 'custom_actions', 'compact_callback', 'namespace', 'callback_data',
+                 'ignore_callback', 'static_buttons', '_initial_date', 'availability', 'availability_provider',
+                 'occupied_slots', 'initial_view', 'views', 'labels', 'select_disabled', 'locale_tables',
+                 'fingerprint', '_sources', '_frozen')
+
+    def __init__(self, initial_date: date = None, initial_view: str = 'day',
                  views: Dict[str, Dict[str, Union[str, List[str], bool]]] = None, labels: Dict[str, str] = None,
-                 custom_actions: list[DatepickerCustomAction] = list()):
+                 custom_actions: Iterable[Type[DatepickerCustomAction]] = (), compact_callback: bool = False,
+                 min_date: date = None, max_date: date = None,
+                 disabled_dates: Union[IntervalSet, Iterable[DateRange]] = None,
+                 availability_provider: Union[AvailabilityProvider, CachedAvailabilityProvider] = None,
+                 namespace: str = None, occupied_slots: Union[IntervalSet, Iterable[DatetimeRange]] = None):
         if labels is None:
-            labels = _default_labels
+            labels = {}
         if views is None:
-            views = _default_views
+            views = {}
+
+        custom_actions = tuple(custom_actions)
 
-        self.available_actions = list(_default_labels.keys())
+        available_actions = _default_actions
         for custom_action in custom_actions:
-            self.available_actions.append(custom_action.action)
+            if custom_action.action in available_actions or custom_action.action in _internal_actions:
+                raise ValueError(f'custom_actions -> {custom_action.__name__} -> action named '
+                                 f'{custom_action.action} already exists')
+            available_actions = available_actions | {custom_action.action}
 
+        self.available_actions = available_actions
         self.custom_actions = custom_actions
-        self.initial_date = initial_date
+        self.compact_callback = compact_callback
+        self.namespace = self.namespace_validate(namespace)
+        if namespace is None:
+            self.callback_data = compact_datepicker_callback if compact_callback else datepicker_callback
+        else:
+            self.callback_data = CompactCallbackData(namespace) if compact_callback else DatepickerCallbackData(namespace)
+        self.ignore_callback = self.callback_data.new('', 'ignore', -1, -1, -1)
+        self.static_buttons = ButtonPool(self.ignore_callback)
+        self._initial_date = initial_date
+        self.availability = self.availability_validate(min_date, max_date, disabled_dates)
+        self.availability_provider = self.availability_provider_validate(availability_provider)
+        self.occupied_slots = self.occupied_slots_validate(occupied_slots)
         self.initial_view = self.initial_view_validate(initial_view)
         self.views = self.initial_views_validate(views)
         self.labels = self.labels_validate(labels)
+        self.select_disabled = MappingProxyType({
+            view: 'select' not in merge_list(settings['header']) and 'select' not in merge_list(settings['footer'])
+            for view, settings in self.views.items()
+        })
+        self.locale_tables = LocaleTables(
+            self.views, self.labels, custom_labels=labels,
+            custom_view_labels=[key for view, key in (('day', 'weekdays_labels'), ('month', 'months_labels'))
+                                if key in views.get(view, {})]
+        )
+        self.fingerprint = self._get_fingerprint()
+        self._sources = (self._source_key(disabled_dates, self.availability.disabled_dates),
+                         self._source_key(occupied_slots, self.occupied_slots), availability_provider)
+
+        self._frozen = True
+
+    def __setattr__(self, key, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError(f'{self.__class__.__name__} is immutable')
+        super().__setattr__(key, value)
+
+    def __delattr__(self, key):
+        raise AttributeError(f'{self.__class__.__name__} is immutable')
+
+    def __eq__(self, other):
+        if not isinstance(other, DatepickerSettings):
+            return NotImplemented
+        return self._key == other._key
+
+    def __hash__(self):
+        return hash(self._key)
+
+    @property
+    def initial_date(self) -> date:
+        if self._initial_date is None:
+            return datetime.now().date()
+        return self._initial_date
+
+    @property
+    def _key(self) -> tuple:
+        return (self.fingerprint, self.custom_actions, self._initial_date, self.initial_view, *self._sources)
+
+    @staticmethod
+    def _source_key(value, interval_set: IntervalSet):
+        if value is None or isinstance(value, IntervalSet):
+            return value
+        return tuple(interval_set)
+
+    def _get_fingerprint(self) -> str:
+        custom_actions = [f'{a.__module__}.{a.__qualname__}:{a.action}:{getattr(a, "label", None)}'
+                          for a in self.custom_actions]
+        digest = sha1()
+        for part in (*self.views.items(), self.labels, custom_actions, self.callback_data.prefix,
+                     self.compact_callback, self.availability.min_date, self.availability.max_date):
+            digest.update(repr(part).encode())
+        return digest.hexdigest()[:16]
 
     @staticmethod
     def initial_view_validate(v):
@@ -76,13 +199,23 @@ class DatepickerSettings:
         if not isinstance(v, dict):
             raise ValueError(f'initial_views -> views should be dict')
 
-        views = _default_views
+        views = {view: dict(settings) for view, settings in _default_views.items()}
         if 'day' in v:
             views['day'].update(v['day'])
 
             if len(views['day']['weekdays_labels']) != 7:
                 raise ValueError(f'day -> weekdays_labels -> should be 7 weekdays labels')
 
+            if views['day']['first_weekday'] not in range(7):
+                raise ValueError(f'day -> first_weekday -> should be from 0 (Monday) to 6 (Sunday)')
+
+            if views['day']['selection'] not in _selection_modes:
+                raise ValueError(f'day -> selection -> should be one of {", ".join(_selection_modes)}')
+
+            if views['day']['selection'] == 'multi' and 'select' not in merge_list(views['day']['header']) \
+                    and 'select' not in merge_list(views['day']['footer']):
+                raise ValueError(f'day -> selection -> multi requires the select action in header or footer')
+
         if 'month' in v:
             views['month'].update(v['month'])
 
@@ -92,11 +225,27 @@ class DatepickerSettings:
         if 'year' in v:
             views['year'].update(v['year'])
 
+        if 'time' in v:
+            views['time'].update(v['time'])
+
+            try:
+                start, end = parse_minutes(views['time']['start']), parse_minutes(views['time']['end'])
+            except (AttributeError, ValueError):
+                raise ValueError(f'time -> start, end -> should be HH:MM strings or time objects')
+            if not 0 <= start < end <= 24 * 60:
+                raise ValueError(f'time -> start -> should be earlier than end')
+
+            if not isinstance(views['time']['step'], int) or views['time']['step'] <= 0:
+                raise ValueError(f'time -> step -> should be positive number of minutes')
+
+            if not isinstance(views['time']['columns'], int) or not 1 <= views['time']['columns'] <= 8:
+                raise ValueError(f'time -> columns -> should be from 1 to 8')
+
         for view in _available_views:
             if isinstance(views[view]['header'], str):
                 views[view]['header'] = views[view]['header'].split(',')
             if isinstance(views[view]['footer'], str):
-                views[view]['header'] = views[view]['header'].split(',')
+                views[view]['footer'] = views[view]['footer'].split(',')
 
             for action in merge_list(views[view]['header']):
                 if action not in self.available_actions:
@@ -106,11 +255,40 @@ class DatepickerSettings:
                 if action not in self.available_actions:
                     raise ValueError(f'views -> {view} -> footer -> no action named {action}')
 
-        return views
+        return MappingProxyType({
+            view: MappingProxyType({key: freeze_list(value) for key, value in settings.items()})
+            for view, settings in views.items()
+        })
+
+    @staticmethod
+    def namespace_validate(v):
+        if v is None:
+            return v
+        if not isinstance(v, str) or not v or len(v) > 16 or ':' in v:
+            raise ValueError('namespace -> should be a non-empty string up to 16 characters without ":"')
+        return v
+
+    @staticmethod
+    def availability_validate(min_date, max_date, disabled_dates):
+        if disabled_dates is not None and not isinstance(disabled_dates, IntervalSet):
+            disabled_dates = DisabledDates(disabled_dates)
+        return Availability(min_date, max_date, disabled_dates)
+
+    @staticmethod
+    def occupied_slots_validate(v):
+        if v is not None and not isinstance(v, IntervalSet):
+            v = OccupiedSlots(v)
+        return v
+
+    @staticmethod
+    def availability_provider_validate(v):
+        if v is not None and not isinstance(v, CachedAvailabilityProvider):
+            v = CachedAvailabilityProvider(v)
+        return v
 
     @staticmethod
     def labels_validate(v):
-        labels = _default_labels
+        labels = dict(_default_labels)
         labels.update(v)
 
-        return labels
+        return MappingProxyType(labels)
@@ -1,3 +1,5 @@
+from .base import BaseView
 from .day import DayView
 from .month import MonthView
 from .year import YearView
+from .time import TimeView
@@ -1,48 +1,188 @@
+import calendar
 from abc import ABC, abstractmethod
 from datetime import date
-from typing import Union
+from time import perf_counter
+from typing import Union, Tuple, Dict, Optional, Mapping, List
 
 from aiogram.types import CallbackQuery
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.callback_data import CallbackData
 
-from ..callback_data import datepicker_callback
+from ..cache import MarkupCache, CachedMarkup, SerializedMarkup, markup_cache as default_markup_cache
+from ..callback_data import CompactCallbackData
+from ..custom_action import DatepickerCustomAction
+from ..helpers import shift_month, shift_year
+from ..i18n import LocaleTable, current_locale
+from ..instrumentation import DatepickerObserver
 
 
 class BaseView(ABC):
-    _datepicker_callback: CallbackData = datepicker_callback
+    __slots__ = ('markup_cache', 'edit_markup', 'serialize_markup', 'observers', 'fingerprint', 'custom_action_classes',
+                 '_datepicker_callback', 'ignore_callback', 'static_buttons', 'select_disabled', 'availability',
+                 'locale_tables', 'custom_actions', '_renderers', '_processors', 'settings', 'set_view')
 
-    def _get_callback(self, view: str, action: str, year: int, month: int, day: int) -> str:
-        return self.datepicker_callback.new(view, action, year, month, day)
+    name: str
 
-    def _insert_actions(self, markup, actions, view, year, month, day):
+    def _get_callback(self, view: str, action: str, year: int, month: int, day: int, extra: str = '') -> str:
+        if action == 'ignore':
+            return self.ignore_callback
+        return self.datepicker_callback.new(view, action, year, month, day, extra)
+
+    def _insert_actions(self, markup, actions, view, year, month, day, extra=''):
         if len(actions):
             markup.row()
             for action in actions:
-                if isinstance(action, list):
+                if isinstance(action, (list, tuple)):
                     markup.row()
                     for _action in action:
-                        markup.insert(self._get_action(view, _action, year, month, day))
+                        markup.insert(self._get_action(view, _action, year, month, day, extra))
                 else:
-                    markup.insert(self._get_action(view, action, year, month, day))
+                    markup.insert(self._get_action(view, action, year, month, day, extra))
         return markup
 
     @abstractmethod
-    def __init__(self, settings: dict, set_view):
-        pass
+    def __init__(self, settings, set_view, markup_cache: MarkupCache = None, edit_markup=None,
+                 serialize_markup: bool = False, observers: Tuple[DatepickerObserver, ...] = (),
+                 custom_actions: Dict[str, DatepickerCustomAction] = None):
+        self.markup_cache = markup_cache if markup_cache is not None else default_markup_cache
+        self.edit_markup = edit_markup if edit_markup is not None else self._edit_markup
+        self.serialize_markup = serialize_markup
+        self.observers = observers
+        self.fingerprint = settings.fingerprint
+        self.custom_action_classes = settings.custom_actions
+        self._datepicker_callback = settings.callback_data
+        self.ignore_callback = settings.ignore_callback
+        self.static_buttons = settings.static_buttons
+        self.select_disabled = settings.select_disabled[self.name]
+        self.availability = settings.availability
+        self.locale_tables = settings.locale_tables
 
-    @abstractmethod
-    def _get_action(self, view: str, action: str, year: int, month: int, day: int) -> InlineKeyboardButton:
-        pass
+        if custom_actions is None:
+            custom_actions = {action.action: action(settings, set_view) for action in settings.custom_actions}
+        self.custom_actions = custom_actions
+
+        self._renderers = {}
+        self._processors = {}
+
+    def _register_actions(self, renderers: dict, processors: dict):
+        self._renderers.update(renderers)
+        self._processors.update(processors)
+
+        for action, custom_action in self.custom_actions.items():
+            self._renderers[action] = self._get_custom_renderer(custom_action)
+            self._processors[action] = self._get_custom_processor(custom_action)
+
+    @staticmethod
+    def _get_custom_renderer(custom_action):
+        def renderer(view: str, action: str, year: int, month: int, day: int,
+                     extra: str = '') -> InlineKeyboardButton:
+            return custom_action.get_action(view, year, month, day)
+
+        return renderer
+
+    def _get_custom_processor(self, custom_action):
+        async def processor(query: CallbackQuery, _date: date, extra: str = '') -> Union[date, bool]:
+            return await custom_action.process(query, self.name, _date)
+
+        return processor
+
+    def _get_ignore_action(self, view: str, action: str, year: int, month: int, day: int,
+                           extra: str = '') -> InlineKeyboardButton:
+        return self.static_buttons.get(self.labels[action])
+
+    def _get_action(self, view: str, action: str, year: int, month: int, day: int,
+                    extra: str = '') -> InlineKeyboardButton:
+        renderer = self._renderers.get(action)
+        if renderer is not None:
+            return renderer(view, action, year, month, day, extra)
+
+    @property
+    def locale_table(self) -> LocaleTable:
+        return self.locale_tables.get(current_locale.get())
+
+    @property
+    def labels(self) -> Mapping[str, str]:
+        return self.locale_table.labels
 
     @property
-    def datepicker_callback(self) -> CallbackData:
+    def datepicker_callback(self) -> Union[CallbackData, CompactCallbackData]:
         return self._datepicker_callback
 
-    @abstractmethod
-    def get_markup(self, _date: date = None) -> InlineKeyboardMarkup:
+    def get_markup(self, _date: date = None, serialized: bool = False,
+                   **kwargs) -> Union[InlineKeyboardMarkup, SerializedMarkup]:
+        locale = current_locale.get()
+        key = (self.name, self.fingerprint, self.custom_action_classes,
+               locale.fingerprint if locale is not None else None,
+               _date, self.markup_cache.today, self.availability.digest,
+               *self._get_cache_key_extra(_date), *sorted(kwargs.items()))
+
+        started = perf_counter() if self.observers else 0
+
+        cached = self.markup_cache.get(key)
+        hit = cached is not None
+        if not hit:
+            cached = CachedMarkup(self._render(_date, **kwargs))
+            self.markup_cache.set(key, cached)
+
+        if self.observers:
+            duration = perf_counter() - started
+            for observer in self.observers:
+                observer.on_render(self.name, duration, hit)
+
+        if serialized:
+            return cached.serialized
+        markup = cached.markup
+        return InlineKeyboardMarkup(row_width=markup.row_width,
+                                    inline_keyboard=[list(row) for row in markup.inline_keyboard])
+
+    def _nearest_month(self, _date: date, step: int) -> Optional[date]:
+        if self.availability.unrestricted:
+            return _date
+
+        start = date(_date.year, _date.month, 1).toordinal()
+        if step < 0:
+            start += calendar.monthrange(_date.year, _date.month)[1] - 1
+
+        ordinal = self.availability.next_enabled(start, step)
+        if ordinal is None:
+            return None
+        found = date.fromordinal(ordinal)
+        return shift_month(_date, (found.year - _date.year) * 12 + found.month - _date.month)
+
+    def _nearest_year(self, _date: date, step: int) -> Optional[date]:
+        if self.availability.unrestricted:
+            return _date
+
+        start = date(_date.year, 1, 1) if step > 0 else date(_date.year, 12, 31)
+        ordinal = self.availability.next_enabled(start.toordinal(), step)
+        if ordinal is None:
+            return None
+        return shift_year(_date, date.fromordinal(ordinal).year - _date.year)
+
+    @staticmethod
+    async def _edit_markup(query: CallbackQuery, markup: InlineKeyboardMarkup):
+        return await query.message.edit_reply_markup(markup)
+
+    def get_selection_kwargs(self, selection: Union[date, Tuple[date, date], None]) -> dict:
+        return {}
+
+    def _get_cache_key_extra(self, _date: date) -> tuple:
+        return ()
+
+    async def prepare(self, _date: date):
         pass
 
+    async def _show(self, query: CallbackQuery, _date: date, **kwargs):
+        await self.prepare(_date)
+        return await self.edit_markup(query, self.get_markup(_date, serialized=self.serialize_markup, **kwargs))
+
     @abstractmethod
-    async def process(self, query: CallbackQuery, action: str, _date: date) -> Union[date, bool]:
+    def _render(self, _date: date, **kwargs) -> InlineKeyboardMarkup:
         pass
+
+    async def process(self, query: CallbackQuery, action: str, _date: date,
+                      extra: str = '') -> Union[date, Tuple[date, date], List[date], bool]:
+        processor = self._processors.get(action)
+        if processor is None:
+            return False
+        return await processor(query, _date, extra)
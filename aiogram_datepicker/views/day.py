@@ -1,112 +1,294 @@
 import calendar
+import logging
 from datetime import datetime, date
-from typing import Union
+from typing import Union, Tuple, Dict, Optional, List, Iterable
 
 from aiogram.types import CallbackQuery
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
 from .base import BaseView
-from ..helpers import merge_list
+from ..cache import MarkupCache
+from ..callback_data import encode_ordinal, decode_ordinal, encode_bits, decode_bits, max_callback_size
+from ..custom_action import DatepickerCustomAction
+from ..grid import MonthGrid, month_grid
+from ..helpers import merge_list, shift_month, shift_year
+from ..instrumentation import DatepickerObserver
 from ..settings import DatepickerSettings
 
+logger = logging.getLogger(__name__)
+
 
 class DayView(BaseView):
-    def __init__(self, settings: DatepickerSettings, set_view):
-        super().__init__(settings, set_view)
-        self.custom_actions = []
-        for custom_action in settings.custom_actions:
-            self.custom_actions.append(custom_action(settings, set_view))
+    __slots__ = ('provider', 'range_selection', 'time_selection', 'multi_selection', 'first_weekday',
+                 'extra_actions')
+
+    name = 'day'
+    month_grid: MonthGrid = month_grid
+    multi_overflow_text = 'Too many months selected'
+
+    def __init__(self, settings: DatepickerSettings, set_view, markup_cache: MarkupCache = None, edit_markup=None,
+                 serialize_markup: bool = False, observers: Tuple[DatepickerObserver, ...] = (),
+                 custom_actions: Dict[str, DatepickerCustomAction] = None):
+        super().__init__(settings, set_view, markup_cache, edit_markup, serialize_markup, observers, custom_actions)
 
         self.settings = settings.views['day']
-        self.labels = settings.labels
         self.set_view = set_view
-        self.select_disabled = 'select' not in merge_list(self.settings['header']) \
-                               and 'select' not in merge_list(self.settings['footer'])
 
-    def _get_action(self, view: str, action: str, year: int, month: int, day: int) -> InlineKeyboardButton:
-        if action in ['prev-year', 'next-year', 'prev-month', 'next-month', 'ignore']:
-            return InlineKeyboardButton(self.labels[action],
-                                        callback_data=self._get_callback(view, action, year, month, day))
+        self.provider = settings.availability_provider
+
+        self.range_selection = self.settings['selection'] == 'range'
+        self.time_selection = self.settings['selection'] == 'datetime'
+        self.multi_selection = self.settings['selection'] == 'multi'
+        self.first_weekday = self.settings['first_weekday']
+
+        self._register_actions(
+            renderers={
+                'prev-year': self._get_default_action,
+                'next-year': self._get_default_action,
+                'prev-month': self._get_default_action,
+                'next-month': self._get_default_action,
+                'ignore': self._get_ignore_action,
+                'select': self._get_default_action,
+                'days-title': self._get_days_title_action,
+            },
+            processors={
+                'set-view': self._set_view,
+                'select': self._select,
+                'set-day': self._set_day,
+                'prev-year': self._prev_year,
+                'next-year': self._next_year,
+                'prev-month': self._prev_month,
+                'next-month': self._next_month,
+            }
+        )
+
+        self.extra_actions = ('set-day', *(
+            action for action in merge_list(self.settings['header']) + merge_list(self.settings['footer'])
+            if self._renderers.get(action) == self._get_default_action
+        ))
+
+    def _get_default_action(self, view: str, action: str, year: int, month: int, day: int,
+                            extra: str = '') -> InlineKeyboardButton:
+        return InlineKeyboardButton(self.labels[action],
+                                    callback_data=self._get_callback(view, action, year, month, day, extra))
+
+    def _get_days_title_action(self, view: str, action: str, year: int, month: int, day: int,
+                               extra: str = '') -> InlineKeyboardButton:
+        label = self.locale_table.days_titles[month].replace('{year}', str(year))
 
-        elif action == 'days-title':
-            label = self.labels['days-title'].replace('{month}', calendar.month_name[month]) \
-                .replace('{year}', str(year))
+        return InlineKeyboardButton(label, callback_data=self._get_callback('month', 'set-view', year, month, day))
 
-            return InlineKeyboardButton(label,
-                                        callback_data=self._get_callback('month', 'set-view', year, month, day))
+    def _get_cache_key_extra(self, _date: date) -> tuple:
+        if self.provider is None:
+            return ()
+        return self.provider.token(_date.year, _date.month),
 
-        elif action == 'select':
-            return InlineKeyboardButton(self.labels[action],
-                                        callback_data=self._get_callback(view, action, year, month, day))
+    async def prepare(self, _date: date):
+        if self.provider is None:
+            return
 
-        for custom_action in self.custom_actions:
-            if custom_action.action == action:
-                return custom_action.get_action(view, year, month, day)
+        try:
+            await self.provider.load(_date.year, _date.month)
+        except Exception:
+            logger.exception('Failed to load datepicker availability for %s-%s', _date.year, _date.month)
 
-    def get_markup(self, _date: date = None) -> InlineKeyboardMarkup:
+        if self.provider.prefetch_enabled:
+            first_day = date(_date.year, _date.month, 1)
+            for step in (-1, 1):
+                adjacent = shift_month(first_day, step)
+                self.provider.prefetch(adjacent.year, adjacent.month)
+
+    @staticmethod
+    def _parse_range(extra: str) -> Tuple[Optional[int], Optional[int]]:
+        if len(extra) == 4:
+            return decode_ordinal(extra), None
+        if len(extra) == 8:
+            return decode_ordinal(extra[:4]), decode_ordinal(extra[4:])
+        return None, None
+
+    @staticmethod
+    def _parse_multi(extra: str) -> Dict[int, int]:
+        if len(extra) % 10:
+            return {}
+        return {decode_ordinal(extra[i:i + 4]): decode_bits(extra[i + 4:i + 10]) << 1 for i in range(0, len(extra), 10)}
+
+    @staticmethod
+    def _encode_multi(masks: Dict[int, int]) -> str:
+        return ''.join(encode_ordinal(first_day) + encode_bits(mask >> 1, 6)
+                       for first_day, mask in sorted(masks.items()) if mask)
+
+    def get_selection_kwargs(self, selection: Union[date, Tuple[date, date], Iterable[date], None]) -> dict:
+        if selection is None:
+            return {}
+        if self.multi_selection:
+            masks = {}
+            for _date in selection:
+                first_day = date(_date.year, _date.month, 1).toordinal()
+                masks[first_day] = masks.get(first_day, 0) | 1 << _date.day
+            if not masks:
+                return {}
+            return {'extra': self._encode_multi(masks)}
+        if not self.range_selection:
+            return {}
+        if isinstance(selection, date):
+            return {'extra': encode_ordinal(selection.toordinal())}
+        start, end = sorted(selection)
+        return {'extra': encode_ordinal(start.toordinal()) + encode_ordinal(end.toordinal())}
+
+    async def _show(self, query: CallbackQuery, _date: date, extra: str = ''):
+        if extra:
+            return await super()._show(query, _date, extra=extra)
+        return await super()._show(query, _date)
+
+    def _render(self, _date: date, extra: str = '', **kwargs) -> InlineKeyboardMarkup:
         year, month, day = _date.year, _date.month, _date.day
 
         markup = InlineKeyboardMarkup(row_width=7)
 
-        markup = self._insert_actions(markup, self.settings['header'], 'day', year, month, day)
+        markup = self._insert_actions(markup, self.settings['header'], 'day', year, month, day, extra)
 
         if self.settings['show_weekdays']:
             markup.row()
-            for week_day in self.settings['weekdays_labels']:
-                markup.insert(
-                    InlineKeyboardButton(week_day, callback_data=self._get_callback('day', 'ignore', year, month, day)))
+            for week_day in self.locale_table.weekdays_labels:
+                markup.insert(self.static_buttons.get(week_day))
+
+        selected_day = 0 if self.select_disabled or self.range_selection or self.multi_selection else day
+        selected_days = 0
+        if self.multi_selection:
+            selected_days = self._parse_multi(extra).get(date(year, month, 1).toordinal(), 0)
+        range_start, range_end = self._parse_range(extra)
+        if range_start is not None:
+            first = date(year, month, 1).toordinal() - 1
+            range_start -= first
+            range_end = range_end - first if range_end is not None else range_start
+        today = datetime.now().date()
+        present_day = today.day if today.year == year and today.month == month else 0
+        disabled_days = 0 if self.availability.unrestricted else self.availability.month_mask(year, month)
+        day_labels = self.provider.peek(year, month) if self.provider is not None else None
 
         markup.row()
-        month_calendar = calendar.monthcalendar(year, month)
-        for week in month_calendar:
-            for week_day in week:
-                if week_day == 0:
-                    markup.insert(
-                        InlineKeyboardButton(' ', callback_data=self._get_callback('day', 'ignore', year, month, day)))
-                    continue
-
-                label = f'{week_day}'
-                if date(year, month, week_day) == _date and not self.select_disabled:
-                    label = f'{week_day} *'
-                elif date(year, month, week_day) == datetime.now().date():
-                    label = f'• {week_day} •'
-
-                markup.insert(InlineKeyboardButton(
-                    label, callback_data=self._get_callback('day', 'set-day', year, month, week_day)
-                ))
-
-        markup = self._insert_actions(markup, self.settings['footer'], 'day', year, month, day)
+        for week_day in self.month_grid.get(year, month, self.first_weekday):
+            if week_day == 0:
+                markup.insert(self.static_buttons.get(' '))
+                continue
+
+            if disabled_days >> week_day & 1:
+                markup.insert(self.static_buttons.get(self.labels['disabled-day'].replace('{day}', str(week_day))))
+                continue
+
+            if range_start is not None and (week_day == range_start or week_day == range_end):
+                label = self.labels['selected-day'].replace('{day}', str(week_day))
+            elif range_start is not None and range_start < week_day < range_end:
+                label = self.labels['range-day'].replace('{day}', str(week_day))
+            elif selected_days >> week_day & 1 or week_day == selected_day:
+                label = self.labels['selected-day'].replace('{day}', str(week_day))
+            elif week_day == present_day:
+                label = self.labels['present-day'].replace('{day}', str(week_day))
+            elif day_labels and week_day in day_labels:
+                label = day_labels[week_day].replace('{day}', str(week_day))
+            else:
+                label = str(week_day)
+
+            markup.insert(InlineKeyboardButton(
+                label, callback_data=self._get_callback('day', 'set-day', year, month, week_day, extra)
+            ))
+
+        markup = self._insert_actions(markup, self.settings['footer'], 'day', year, month, day, extra)
 
         return markup
 
-    async def process(self, query: CallbackQuery, action: str, _date: date) -> Union[date, bool]:
-        if action == 'select':
+    async def _show_nearest(self, query: CallbackQuery, _date: date, step: int, extra: str = '') -> bool:
+        _date = self._nearest_month(_date, step)
+        if _date is not None:
+            await self._show(query, _date, extra)
+        return False
+
+    async def _set_view(self, query: CallbackQuery, _date: date, extra: str = '') -> bool:
+        await self._show(query, _date)
+        return False
+
+    async def _select(self, query: CallbackQuery, _date: date,
+                      extra: str = '') -> Union[date, Tuple[date, date], List[date], bool]:
+        if self.multi_selection:
+            selected = []
+            for first_day, mask in sorted(self._parse_multi(extra).items()):
+                first_day = date.fromordinal(first_day)
+                days = calendar.monthrange(first_day.year, first_day.month)[1]
+                selected.extend(first_day.replace(day=day) for day in range(1, days + 1) if mask >> day & 1)
+            return [_date for _date in selected if not self.availability.is_day_disabled(_date)] or False
+        if self.range_selection:
+            range_start, range_end = self._parse_range(extra)
+            if range_end is None:
+                return False
+            return date.fromordinal(range_start), date.fromordinal(range_end)
+
+        if self.availability.is_day_disabled(_date):
+            return False
+        if self.time_selection:
+            await self.set_view(query, 'time', _date)
+            return False
+        return _date
+
+    async def _set_day(self, query: CallbackQuery, _date: date,
+                       extra: str = '') -> Union[date, Tuple[date, date], List[date], bool]:
+        if self.availability.is_day_disabled(_date):
+            return False
+        if self.range_selection:
+            return await self._set_range(query, _date, extra)
+        if self.multi_selection:
+            return await self._toggle_day(query, _date, extra)
+        if self.select_disabled:
+            if self.time_selection:
+                await self.set_view(query, 'time', _date)
+                return False
             return _date
+        await self._show(query, _date)
+        return False
 
-        elif action == 'set-day':
-            if self.select_disabled:
-                return _date
-            await query.message.edit_reply_markup(self.get_markup(_date))
+    async def _set_range(self, query: CallbackQuery, _date: date,
+                         extra: str) -> Union[Tuple[date, date], bool]:
+        anchor, range_end = self._parse_range(extra)
+        if anchor is None or range_end is not None:
+            await self._show(query, _date, encode_ordinal(_date.toordinal()))
+            return False
 
-        elif action == 'prev-year':
-            prev_date = date(_date.year - 1, _date.month, _date.day)
-            await query.message.edit_reply_markup(self.get_markup(prev_date))
+        start, end = sorted((date.fromordinal(anchor), _date))
+        if not self.availability.is_range_enabled(start, end):
+            await self._show(query, _date, encode_ordinal(_date.toordinal()))
+            return False
 
-        elif action == 'next-year':
-            next_date = date(_date.year + 1, _date.month, _date.day)
-            await query.message.edit_reply_markup(self.get_markup(next_date))
+        if self.select_disabled:
+            return start, end
+        await self._show(query, _date, encode_ordinal(start.toordinal()) + encode_ordinal(end.toordinal()))
+        return False
 
-        elif action == 'prev-month':
-            prev_date = date(_date.year - int(_date.month == 1), 12 if _date.month == 1 else _date.month - 1, _date.day)
-            await query.message.edit_reply_markup(self.get_markup(prev_date))
+    def _fits_callback(self, _date: date, extra: str) -> bool:
+        day = calendar.monthrange(_date.year, _date.month)[1]
+        size = max(len(self._get_callback('day', action, _date.year, _date.month, day).encode())
+                   for action in self.extra_actions)
+        return size + len(self.datepicker_callback.sep) + len(extra) <= max_callback_size
 
-        elif action == 'next-month':
-            next_date = date(_date.year + int(_date.month == 12), ((_date.month % 12) + 1), _date.day)
-            await query.message.edit_reply_markup(self.get_markup(next_date))
+    async def _toggle_day(self, query: CallbackQuery, _date: date, extra: str) -> bool:
+        masks = self._parse_multi(extra)
+        first_day = date(_date.year, _date.month, 1).toordinal()
+        masks[first_day] = masks.get(first_day, 0) ^ 1 << _date.day
+        extra = self._encode_multi(masks)
 
-        else:
-            for custom_action in self.custom_actions:
-                if custom_action.action == action:
-                    return await custom_action.process(query, 'day', _date)
+        if not self._fits_callback(_date, extra):
+            await query.answer(self.multi_overflow_text, show_alert=True)
+            return False
 
+        await self._show(query, _date, extra)
         return False
+
+    async def _prev_year(self, query: CallbackQuery, _date: date, extra: str = '') -> bool:
+        return await self._show_nearest(query, shift_year(_date, -1), -1, extra)
+
+    async def _next_year(self, query: CallbackQuery, _date: date, extra: str = '') -> bool:
+        return await self._show_nearest(query, shift_year(_date, 1), 1, extra)
+
+    async def _prev_month(self, query: CallbackQuery, _date: date, extra: str = '') -> bool:
+        return await self._show_nearest(query, shift_month(_date, -1), -1, extra)
+
+    async def _next_month(self, query: CallbackQuery, _date: date, extra: str = '') -> bool:
+        return await self._show_nearest(query, shift_month(_date, 1), 1, extra)
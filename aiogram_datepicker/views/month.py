@@ -1,46 +1,58 @@
 from datetime import date
-from typing import Union
+from typing import Union, Tuple, Dict
 
 from aiogram.types import CallbackQuery
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
 from .base import BaseView
-from ..helpers import merge_list
+from ..cache import MarkupCache
+from ..custom_action import DatepickerCustomAction
+from ..helpers import shift_month, shift_year
+from ..instrumentation import DatepickerObserver
 from ..settings import DatepickerSettings
 
 
 class MonthView(BaseView):
-    def __init__(self, settings: DatepickerSettings, set_view):
-        super().__init__(settings, set_view)
-        self.custom_actions = []
-        for custom_action in settings.custom_actions:
-            self.custom_actions.append(custom_action(settings, set_view))
+    __slots__ = ()
 
-        self.settings = settings.views['month']
-        self.labels = settings.labels
-        self.set_view = set_view
-        self.months = settings.views['month']['months_labels']
-        self.select_disabled = 'select' not in merge_list(self.settings['header']) \
-                               and 'select' not in merge_list(self.settings['footer'])
-
-    def _get_action(self, view: str, action: str, year: int, month: int, day: int) -> InlineKeyboardButton:
-        if action in ['prev-year', 'next-year', 'ignore']:
-            return InlineKeyboardButton(self.labels[action],
-                                        callback_data=self._get_callback(view, action, year, month, day))
-
-        elif action == 'year':
-            return InlineKeyboardButton(self.labels['year'].replace('{year}', str(year)),
-                                        callback_data=self._get_callback('year', 'set-view', year, month, day))
+    name = 'month'
 
-        elif action == 'select':
-            return InlineKeyboardButton(self.labels[action],
-                                        callback_data=self._get_callback(view, action, year, month, day))
+    def __init__(self, settings: DatepickerSettings, set_view, markup_cache: MarkupCache = None, edit_markup=None,
+                 serialize_markup: bool = False, observers: Tuple[DatepickerObserver, ...] = (),
+                 custom_actions: Dict[str, DatepickerCustomAction] = None):
+        super().__init__(settings, set_view, markup_cache, edit_markup, serialize_markup, observers, custom_actions)
 
-        for custom_action in self.custom_actions:
-            if custom_action.action == action:
-                return custom_action.get_action(view, year, month, day)
+        self.settings = settings.views['month']
+        self.set_view = set_view
 
-    def get_markup(self, _date: date = None) -> InlineKeyboardMarkup:
+        self._register_actions(
+            renderers={
+                'prev-year': self._get_default_action,
+                'next-year': self._get_default_action,
+                'ignore': self._get_ignore_action,
+                'select': self._get_default_action,
+                'year': self._get_year_action,
+            },
+            processors={
+                'set-view': self._set_view,
+                'set-month': self._set_month,
+                'prev-year': self._prev_year,
+                'next-year': self._next_year,
+                'select': self._select,
+            }
+        )
+
+    def _get_default_action(self, view: str, action: str, year: int, month: int, day: int,
+                            extra: str = '') -> InlineKeyboardButton:
+        return InlineKeyboardButton(self.labels[action],
+                                    callback_data=self._get_callback(view, action, year, month, day))
+
+    def _get_year_action(self, view: str, action: str, year: int, month: int, day: int,
+                         extra: str = '') -> InlineKeyboardButton:
+        return InlineKeyboardButton(self.labels['year'].replace('{year}', str(year)),
+                                    callback_data=self._get_callback('year', 'set-view', year, month, day))
+
+    def _render(self, _date: date, **kwargs) -> InlineKeyboardMarkup:
         year, month, day = _date.year, _date.month, _date.day
 
         markup = InlineKeyboardMarkup(row_width=4)
@@ -48,40 +60,49 @@ class MonthView(BaseView):
         markup = self._insert_actions(markup, self.settings['header'], 'month', year, month, day)
 
         markup.row()
-        for i, month_title in enumerate(self.months, start=1):
+        restricted = not self.availability.unrestricted
+        for i, month_title in enumerate(self.locale_table.months_labels, start=1):
+            if restricted and self.availability.is_month_disabled(year, i):
+                markup.insert(self.static_buttons.get(self.labels['disabled-month'].replace('{month}', month_title)))
+                continue
+
+            month_date = shift_month(_date, i - month)
             markup.insert(InlineKeyboardButton(
                 f'{month_title}*' if i == month and not self.select_disabled else month_title,
-                callback_data=self._get_callback('month', 'set-month', year, i, day)
+                callback_data=self._get_callback('month', 'set-month', year, i, month_date.day)
             ))
 
         markup = self._insert_actions(markup, self.settings['footer'], 'month', year, month, day)
 
         return markup
 
-    async def process(self, query: CallbackQuery, action: str, _date: date) -> Union[date, bool]:
-        if action == 'set-view':
-            await query.message.edit_reply_markup(self.get_markup(_date))
-
-        elif action == 'set-month':
-            if self.select_disabled:
-                await self.set_view(query, 'day', _date)
-            else:
-                await query.message.edit_reply_markup(self.get_markup(_date))
+    async def _set_view(self, query: CallbackQuery, _date: date, extra: str = '') -> bool:
+        await self._show(query, _date)
+        return False
 
-        elif action == 'prev-year':
-            prev_date = date(_date.year - 1, _date.month, _date.day)
-            await query.message.edit_reply_markup(self.get_markup(prev_date))
+    async def _set_month(self, query: CallbackQuery, _date: date, extra: str = '') -> bool:
+        if self.availability.is_month_disabled(_date.year, _date.month):
+            return False
+        if self.select_disabled:
+            await self.set_view(query, 'day', _date)
+        else:
+            await self._show(query, _date)
+        return False
 
-        elif action == 'next-year':
-            next_date = date(_date.year + 1, _date.month, _date.day)
-            await query.message.edit_reply_markup(self.get_markup(next_date))
+    async def _show_nearest(self, query: CallbackQuery, _date: date, step: int) -> bool:
+        _date = self._nearest_year(_date, step)
+        if _date is not None:
+            await self._show(query, _date)
+        return False
 
-        elif action == 'select':
-            await self.set_view(query, 'day', _date)
+    async def _prev_year(self, query: CallbackQuery, _date: date, extra: str = '') -> bool:
+        return await self._show_nearest(query, shift_year(_date, -1), -1)
 
-        else:
-            for custom_action in self.custom_actions:
-                if custom_action.action == action:
-                    return await custom_action.process(query, 'month', _date)
+    async def _next_year(self, query: CallbackQuery, _date: date, extra: str = '') -> bool:
+        return await self._show_nearest(query, shift_year(_date, 1), 1)
 
+    async def _select(self, query: CallbackQuery, _date: date, extra: str = '') -> Union[date, bool]:
+        if self.availability.is_month_disabled(_date.year, _date.month):
+            return False
+        await self.set_view(query, 'day', _date)
         return False
@@ -0,0 +1,134 @@
+from bisect import bisect_right
+from datetime import datetime, date, time
+from typing import Union, Tuple, Dict, Optional
+
+from aiogram.types import CallbackQuery
+from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+
+from .base import BaseView
+from ..cache import MarkupCache
+from ..custom_action import DatepickerCustomAction
+from ..helpers import parse_minutes
+from ..instrumentation import DatepickerObserver
+from ..settings import DatepickerSettings
+
+
+class TimeView(BaseView):
+    __slots__ = ('occupied_slots', 'step', 'disable_past', 'slots')
+
+    name = 'time'
+
+    def __init__(self, settings: DatepickerSettings, set_view, markup_cache: MarkupCache = None, edit_markup=None,
+                 serialize_markup: bool = False, observers: Tuple[DatepickerObserver, ...] = (),
+                 custom_actions: Dict[str, DatepickerCustomAction] = None):
+        super().__init__(settings, set_view, markup_cache, edit_markup, serialize_markup, observers, custom_actions)
+
+        self.settings = settings.views['time']
+        self.set_view = set_view
+        self.occupied_slots = settings.occupied_slots
+
+        self.step = self.settings['step']
+        self.disable_past = self.settings['disable_past']
+        self.slots = tuple(range(parse_minutes(self.settings['start']), parse_minutes(self.settings['end']),
+                                 self.step))
+
+        self._register_actions(
+            renderers={
+                'prev-day': self._get_default_action,
+                'next-day': self._get_default_action,
+                'ignore': self._get_ignore_action,
+                'time-title': self._get_time_title_action,
+            },
+            processors={
+                'set-view': self._set_view,
+                'set-time': self._set_time,
+                'prev-day': self._prev_day,
+                'next-day': self._next_day,
+            }
+        )
+
+    def _get_default_action(self, view: str, action: str, year: int, month: int, day: int,
+                            extra: str = '') -> InlineKeyboardButton:
+        return InlineKeyboardButton(self.labels[action],
+                                    callback_data=self._get_callback(view, action, year, month, day))
+
+    def _get_time_title_action(self, view: str, action: str, year: int, month: int, day: int,
+                               extra: str = '') -> InlineKeyboardButton:
+        label = self.labels['time-title'].replace('{date}', f'{day:02}.{month:02}.{year}')
+        return InlineKeyboardButton(label, callback_data=self._get_callback('day', 'set-view', year, month, day))
+
+    def _get_cutoff(self, _date: date) -> int:
+        if not self.disable_past:
+            return -1
+
+        now = datetime.now()
+        if _date != now.date():
+            return -1 if _date > now.date() else 24 * 60
+        return now.hour * 60 + now.minute
+
+    def _get_cache_key_extra(self, _date: date) -> tuple:
+        occupied = self.occupied_slots.digest if self.occupied_slots is not None else 0
+        return occupied, bisect_right(self.slots, self._get_cutoff(_date))
+
+    def _is_free(self, _date: date, minute: int, cutoff: int) -> bool:
+        if minute <= cutoff:
+            return False
+        if self.occupied_slots is None:
+            return True
+        start = _date.toordinal() * 1440 + minute
+        return not self.occupied_slots.overlaps(start, start + self.step - 1)
+
+    def _render(self, _date: date, **kwargs) -> InlineKeyboardMarkup:
+        year, month, day = _date.year, _date.month, _date.day
+
+        markup = InlineKeyboardMarkup(row_width=self.settings['columns'])
+
+        markup = self._insert_actions(markup, self.settings['header'], 'time', year, month, day)
+
+        cutoff = self._get_cutoff(_date)
+        day_disabled = self.availability.is_day_disabled(_date)
+        labels = self.labels
+
+        markup.row()
+        for minute in self.slots:
+            label = f'{minute // 60:02}:{minute % 60:02}'
+            if day_disabled or not self._is_free(_date, minute, cutoff):
+                markup.insert(self.static_buttons.get(labels['occupied-slot'].replace('{time}', label)))
+                continue
+
+            markup.insert(InlineKeyboardButton(
+                labels['time-slot'].replace('{time}', label),
+                callback_data=self._get_callback('time', 'set-time', year, month, day, str(minute))
+            ))
+
+        markup = self._insert_actions(markup, self.settings['footer'], 'time', year, month, day)
+
+        return markup
+
+    def _nearest_day(self, _date: date, step: int) -> Optional[date]:
+        ordinal = self.availability.next_enabled(_date.toordinal() + step, step)
+        return date.fromordinal(ordinal) if ordinal is not None else None
+
+    async def _set_view(self, query: CallbackQuery, _date: date, extra: str = '') -> bool:
+        await self._show(query, _date)
+        return False
+
+    async def _set_time(self, query: CallbackQuery, _date: date, extra: str = '') -> Union[datetime, bool]:
+        minute = int(extra)
+        if minute not in self.slots or self.availability.is_day_disabled(_date) \
+                or not self._is_free(_date, minute, self._get_cutoff(_date)):
+            await self._show(query, _date)
+            return False
+        return datetime.combine(_date, time(minute // 60, minute % 60))
+
+    async def _prev_day(self, query: CallbackQuery, _date: date, extra: str = '') -> bool:
+        _date = self._nearest_day(_date, -1)
+        if _date is not None:
+            await self._show(query, _date)
+        return False
+
+    async def _next_day(self, query: CallbackQuery, _date: date, extra: str = '') -> bool:
+        _date = self._nearest_day(_date, 1)
+        if _date is not None:
+            await self._show(query, _date)
+        return False
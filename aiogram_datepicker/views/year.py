@@ -1,37 +1,50 @@
 from datetime import date
-from typing import Union
+from typing import Tuple, Dict, Optional
 
 from aiogram.types import CallbackQuery
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
 from .base import BaseView
-from ..helpers import merge_list
+from ..cache import MarkupCache
+from ..custom_action import DatepickerCustomAction
+from ..helpers import shift_year
+from ..instrumentation import DatepickerObserver
 from ..settings import DatepickerSettings
 
 
 class YearView(BaseView):
-    def __init__(self, settings: DatepickerSettings, set_view):
-        super().__init__(settings, set_view)
-        self.custom_actions = []
-        for custom_action in settings.custom_actions:
-            self.custom_actions.append(custom_action(settings, set_view))
+    __slots__ = ()
 
-        self.settings = settings.views['year']
-        self.labels = settings.labels
-        self.set_view = set_view
-        self.select_disabled = 'select' not in merge_list(self.settings['header']) \
-                               and 'select' not in merge_list(self.settings['footer'])
+    name = 'year'
 
-    def _get_action(self, view: str, action: str, year: int, month: int, day: int) -> InlineKeyboardButton:
-        if action in ['prev-years', 'next-years', 'ignore']:
-            return InlineKeyboardButton(self.labels[action],
-                                        callback_data=self._get_callback(view, action, year, month, day))
+    def __init__(self, settings: DatepickerSettings, set_view, markup_cache: MarkupCache = None, edit_markup=None,
+                 serialize_markup: bool = False, observers: Tuple[DatepickerObserver, ...] = (),
+                 custom_actions: Dict[str, DatepickerCustomAction] = None):
+        super().__init__(settings, set_view, markup_cache, edit_markup, serialize_markup, observers, custom_actions)
 
-        for custom_action in self.custom_actions:
-            if custom_action.action == action:
-                return custom_action.get_action(view, year, month, day)
+        self.settings = settings.views['year']
+        self.set_view = set_view
 
-    def get_markup(self, _date: date = None, offset: int = 4) -> InlineKeyboardMarkup:
+        self._register_actions(
+            renderers={
+                'prev-years': self._get_default_action,
+                'next-years': self._get_default_action,
+                'ignore': self._get_ignore_action,
+            },
+            processors={
+                'set-view': self._set_view,
+                'prev-years': self._prev_years,
+                'next-years': self._next_years,
+                'set-year': self._set_year,
+            }
+        )
+
+    def _get_default_action(self, view: str, action: str, year: int, month: int, day: int,
+                            extra: str = '') -> InlineKeyboardButton:
+        return InlineKeyboardButton(self.labels[action],
+                                    callback_data=self._get_callback(view, action, year, month, day))
+
+    def _render(self, _date: date, offset: int = 4, **kwargs) -> InlineKeyboardMarkup:
         year, month, day = _date.year, _date.month, _date.day
 
         markup = InlineKeyboardMarkup(row_width=3)
@@ -39,34 +52,56 @@ class YearView(BaseView):
         markup = self._insert_actions(markup, self.settings['header'], 'year', year, month, day)
 
         markup.row()
+        restricted = not self.availability.unrestricted
         for value in range(year - offset, year + offset + 1):
+            if restricted and (not date.min.year <= value <= date.max.year or self.availability.is_year_disabled(value)):
+                markup.insert(self.static_buttons.get(self.labels['disabled-year'].replace('{year}', str(value))))
+                continue
+
+            value_date = shift_year(_date, value - year)
             markup.insert(InlineKeyboardButton(
                 f'{value}*' if year == value else str(value),
-                callback_data=self._get_callback('year', 'set-year', value, month, day)
+                callback_data=self._get_callback('year', 'set-year', value, month, value_date.day)
             ))
 
         markup = self._insert_actions(markup, self.settings['footer'], 'year', year, month, day)
 
         return markup
 
-    async def process(self, query: CallbackQuery, action: str, _date: date) -> Union[date, bool]:
-        if action == 'set-view':
-            await query.message.edit_reply_markup(self.get_markup(_date))
-
-        elif action == 'prev-years':
-            prev_date = date(_date.year - 9, _date.month, _date.day)
-            await query.message.edit_reply_markup(self.get_markup(prev_date))
+    async def _set_view(self, query: CallbackQuery, _date: date, extra: str = '') -> bool:
+        await self._show(query, _date)
+        return False
 
-        elif action == 'next-years':
-            next_date = date(_date.year + 9, _date.month, _date.day)
-            await query.message.edit_reply_markup(self.get_markup(next_date))
+    def _nearest_page(self, _date: date, step: int) -> Optional[date]:
+        if self.availability.unrestricted:
+            return shift_year(_date, 9 * step)
+
+        edge = _date.year + 5 * step
+        if not date.min.year <= edge <= date.max.year:
+            return None
+        nearest = self._nearest_year(shift_year(_date, 5 * step), step)
+        if nearest is None:
+            return None
+
+        year = _date.year + 9 * step
+        if abs(nearest.year - _date.year) > 13:
+            year = nearest.year + 4 * step
+        return shift_year(_date, min(max(year, date.min.year), date.max.year) - _date.year)
+
+    async def _show_page(self, query: CallbackQuery, _date: date, step: int) -> bool:
+        _date = self._nearest_page(_date, step)
+        if _date is not None:
+            await self._show(query, _date)
+        return False
 
-        elif action == 'set-year':
-            await self.set_view(query, 'month', _date)
+    async def _prev_years(self, query: CallbackQuery, _date: date, extra: str = '') -> bool:
+        return await self._show_page(query, _date, -1)
 
-        else:
-            for custom_action in self.custom_actions:
-                if custom_action.action == action:
-                    return await custom_action.process(query, 'year', _date)
+    async def _next_years(self, query: CallbackQuery, _date: date, extra: str = '') -> bool:
+        return await self._show_page(query, _date, 1)
 
+    async def _set_year(self, query: CallbackQuery, _date: date, extra: str = '') -> bool:
+        if self.availability.is_year_disabled(_date.year):
+            return False
+        await self.set_view(query, 'month', _date)
         return False
@@ -0,0 +1,207 @@
+"""
+Datepicker benchmarks.
+
+    python benchmarks/bench.py              # run and compare against benchmarks/baseline.json
+    python benchmarks/bench.py --save       # run and store the results as the new baseline
+    python benchmarks/bench.py -k render    # run only benchmarks containing "render"
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiogram.types import InlineKeyboardButton, CallbackQuery
+
+from aiogram_datepicker import Datepicker, DatepickerSettings, DatepickerCustomAction, MarkupCache, MmapBackend
+from aiogram_datepicker.callback_data import datepicker_callback, compact_datepicker_callback
+from fakes import FakeCallbackQuery, FakeMessage
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+DATE = date(2022, 3, 23)
+
+ACTIONS = {
+    'day': ['select', 'set-day', 'prev-year', 'next-year', 'prev-month', 'next-month', 'ignore'],
+    'month': ['set-view', 'set-month', 'prev-year', 'next-year', 'select'],
+    'year': ['set-view', 'prev-years', 'next-years', 'set-year'],
+}
+
+
+def _custom_action(name: str):
+    class CustomAction(DatepickerCustomAction):
+        action = name
+        label = name.title()
+
+        def get_action(self, view: str, year: int, month: int, day: int) -> InlineKeyboardButton:
+            return InlineKeyboardButton(self.label, callback_data=self._get_callback(view, self.action, year, month, day))
+
+        async def process(self, query: CallbackQuery, view: str, _date: date) -> bool:
+            await self.set_view(query, view, _date)
+            return False
+
+    CustomAction.__qualname__ = f'CustomAction_{name}'
+    return CustomAction
+
+
+CUSTOM_ACTIONS = [_custom_action(f'custom-{i}') for i in range(10)]
+
+
+def _settings(**kwargs) -> DatepickerSettings:
+    return DatepickerSettings(
+        initial_date=DATE,
+        views={
+            'day': {'footer': ['prev-month', 'select', 'next-month', ['custom-0', 'custom-1']]},
+            'month': {'footer': ['select', 'custom-2']},
+            'year': {'header': ['custom-3']},
+        },
+        custom_actions=CUSTOM_ACTIONS,
+        **kwargs
+    )
+
+
+def get_benchmarks() -> dict:
+    benchmarks = {}
+
+    cold = Datepicker(_settings(), markup_cache=MarkupCache(maxsize=0))
+    warm = Datepicker(_settings(), markup_cache=MarkupCache())
+    for view in ('day', 'month', 'year'):
+        benchmarks[f'render.{view}.cold'] = lambda view=view: cold.views[view].get_markup(DATE)
+        benchmarks[f'render.{view}.warm'] = lambda view=view: warm.views[view].get_markup(DATE)
+        benchmarks[f'render.{view}.serialized'] = lambda view=view: warm.views[view].get_markup(DATE, serialized=True)
+
+    shared_cache = MarkupCache(backend=MmapBackend(os.path.join(tempfile.mkdtemp(), 'markup.cache')))
+    shared = Datepicker(_settings(), markup_cache=shared_cache)
+    shared.views['day'].get_markup(DATE)
+
+    def render_shared():
+        shared_cache.clear()
+        return shared.views['day'].get_markup(DATE, serialized=True)
+
+    benchmarks['render.day.shared'] = render_shared
+
+    for view, actions in ACTIONS.items():
+        for action in actions:
+            data = {'view': view, 'action': action, 'year': DATE.year, 'month': DATE.month, 'day': DATE.day}
+
+            async def process(data=data):
+                await cold.process(FakeCallbackQuery(), data)
+
+            benchmarks[f'process.{view}.{action}'] = process
+
+    unchanged = FakeMessage(reply_markup=warm.views['day'].get_markup(DATE))
+    unchanged_data = {'view': 'day', 'action': 'set-day', 'year': DATE.year, 'month': DATE.month, 'day': DATE.day}
+
+    async def process_unchanged():
+        await warm.process(FakeCallbackQuery(message=unchanged), unchanged_data)
+
+    benchmarks['process.day.set-day.unchanged'] = process_unchanged
+
+    compact = Datepicker(_settings(compact_callback=True), markup_cache=MarkupCache(maxsize=0))
+    compact_data = compact_datepicker_callback.new('day', 'next-month', DATE.year, DATE.month, DATE.day)
+
+    async def process_compact():
+        await compact.process(FakeCallbackQuery(compact_data))
+
+    benchmarks['process.compact.next-month'] = process_compact
+
+    benchmarks['settings.default'] = lambda: DatepickerSettings(initial_date=DATE)
+    benchmarks['settings.custom_actions'] = _settings
+    benchmarks['datepicker.construct'] = lambda: Datepicker(_settings())
+
+    legacy_data = datepicker_callback.new('day', 'set-day', DATE.year, DATE.month, DATE.day)
+    benchmarks['callback.legacy.encode'] = lambda: datepicker_callback.new('day', 'set-day', 2022, 3, 23)
+    benchmarks['callback.legacy.decode'] = lambda: datepicker_callback.parse(legacy_data)
+    benchmarks['callback.compact.encode'] = lambda: compact_datepicker_callback.new('day', 'set-day', 2022, 3, 23)
+    benchmarks['callback.compact.decode'] = lambda: compact_datepicker_callback.parse(compact_data)
+
+    return benchmarks
+
+
+def _measure(func, duration: float) -> dict:
+    is_async = inspect.iscoroutinefunction(func)
+    loop = asyncio.new_event_loop()
+
+    async def run_async(n):
+        for _ in range(n):
+            await func()
+
+    def run(n):
+        if is_async:
+            loop.run_until_complete(run_async(n))
+        else:
+            for _ in range(n):
+                func()
+
+    run(10)
+
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    run(1)
+    allocated = tracemalloc.get_traced_memory()[1] - start
+    tracemalloc.stop()
+
+    n, elapsed = 1, 0.0
+    while elapsed < duration:
+        n *= 2
+        started = time.perf_counter()
+        run(n)
+        elapsed = time.perf_counter() - started
+
+    loop.close()
+    return {'ops': round(n / elapsed, 1), 'alloc': allocated}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-k', dest='keyword', default='', help='run only benchmarks containing this substring')
+    parser.add_argument('--duration', type=float, default=0.2, help='minimal measuring time per benchmark, seconds')
+    parser.add_argument('--tolerance', type=float, default=0.3, help='allowed relative regression')
+    parser.add_argument('--save', action='store_true', help='store results as the new baseline')
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+
+    results, regressions = {}, []
+    print(f'{"benchmark":<32} {"ops/sec":>12} {"baseline":>12} {"alloc, B":>10} {"baseline":>10}')
+    for name, func in get_benchmarks().items():
+        if args.keyword not in name:
+            continue
+
+        result = results[name] = _measure(func, args.duration)
+        base = baseline.get(name, {})
+
+        status = ''
+        if base and result['ops'] < base['ops'] * (1 - args.tolerance):
+            status = 'SLOWER'
+        elif base and result['alloc'] > base['alloc'] * (1 + args.tolerance) + 1024:
+            status = 'MORE ALLOC'
+        if status:
+            regressions.append(name)
+
+        print(f'{name:<32} {result["ops"]:>12} {base.get("ops", "-"):>12} '
+              f'{result["alloc"]:>10} {base.get("alloc", "-"):>10} {status}')
+
+    if args.save:
+        baseline.update(results)
+        with open(BASELINE_PATH, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f'baseline saved to {BASELINE_PATH}')
+    elif regressions:
+        print(f'{len(regressions)} regression(s): {", ".join(regressions)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+from typing import List, Optional
+
+from aiogram.types import InlineKeyboardMarkup
+
+
+class FakeChat:
+    def __init__(self, chat_id: int = 1, chat_type: str = 'private'):
+        self.id = chat_id
+        self.type = chat_type
+
+
+class FakeUser:
+    def __init__(self, user_id: int = 1, language_code: str = 'en'):
+        self.id = user_id
+        self.language_code = language_code
+
+
+class FakeMessage:
+    def __init__(self, chat: FakeChat = None, message_id: int = 1, reply_markup: InlineKeyboardMarkup = None):
+        self.chat = chat or FakeChat()
+        self.message_id = message_id
+        self.reply_markup = reply_markup
+        self.edits: List[InlineKeyboardMarkup] = []
+
+    async def edit_reply_markup(self, reply_markup: InlineKeyboardMarkup = None):
+        self.edits.append(reply_markup)
+        self.reply_markup = reply_markup
+        return self
+
+    async def answer(self, text: str, reply_markup: InlineKeyboardMarkup = None, **kwargs):
+        return FakeMessage(self.chat, self.message_id + 1, reply_markup)
+
+    async def delete(self):
+        return True
+
+
+class FakeCallbackQuery:
+    def __init__(self, data: str = '', message: FakeMessage = None, from_user: FakeUser = None):
+        self.id = '1'
+        self.data = data
+        self.message = message or FakeMessage()
+        self.from_user = from_user or FakeUser()
+        self.answers = 0
+
+    async def answer(self, text: Optional[str] = None, show_alert: Optional[bool] = None, url: Optional[str] = None,
+                     cache_time: Optional[int] = None):
+        self.answers += 1
+        return True
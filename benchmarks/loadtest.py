@@ -0,0 +1,335 @@
+"""
+Datepicker load test.
+
+Simulates many concurrent users clicking through calendars against a fake bot with API latency and
+Telegram-like flood limits, and reports throughput, latency percentiles and memory growth.
+
+    python benchmarks/loadtest.py                                 # 1000 users for 30 seconds
+    python benchmarks/loadtest.py --users 5000 --duration 60 --scheduler --coalescer
+    python benchmarks/loadtest.py --mix set-day=10,next-month=5,select=1 --json
+"""
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiogram.types import InlineKeyboardButton, CallbackQuery, InlineKeyboardMarkup
+from aiogram.utils.exceptions import RetryAfter
+
+from aiogram_datepicker import (Datepicker, DatepickerSettings, DatepickerCustomAction, MarkupCache,
+                                NavigationCoalescer, EditScheduler)
+from aiogram_datepicker.scheduler import TokenBucket
+from fakes import FakeChat, FakeUser, FakeMessage, FakeCallbackQuery
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+DEFAULT_MIX = {
+    'set-day': 40,
+    'next-month': 12,
+    'prev-month': 6,
+    'select': 10,
+    'set-view': 8,
+    'set-month': 6,
+    'set-year': 5,
+    'prev-year': 3,
+    'next-year': 3,
+    'prev-years': 2,
+    'next-years': 2,
+    'today': 2,
+    'cancel': 1,
+    'ignore': 2,
+}
+
+
+class TodayAction(DatepickerCustomAction):
+    action = 'today'
+    label = 'Today'
+
+    def get_action(self, view: str, year: int, month: int, day: int) -> InlineKeyboardButton:
+        return InlineKeyboardButton(self.label, callback_data=self._get_callback(view, self.action, year, month, day))
+
+    async def process(self, query: CallbackQuery, view: str, _date: date) -> bool:
+        await self.set_view(query, 'day', date.today())
+        return False
+
+
+class CancelAction(DatepickerCustomAction):
+    action = 'cancel'
+    label = 'Cancel'
+
+    def get_action(self, view: str, year: int, month: int, day: int) -> InlineKeyboardButton:
+        return InlineKeyboardButton(self.label, callback_data=self._get_callback(view, self.action, year, month, day))
+
+    async def process(self, query: CallbackQuery, view: str, _date: date) -> bool:
+        await query.message.delete()
+        return False
+
+
+class FakeBot:
+    def __init__(self, latency: float, jitter: float, rate: float, chat_rate: float, chat_burst: float, seed: int):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate = rate
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.random = random.Random(seed)
+
+        self.calls = 0
+        self.flood_errors = 0
+
+        self._global = TokenBucket(rate, rate)
+        self._chats: Dict[int, TokenBucket] = {}
+
+    async def request(self, chat_id: int):
+        self.calls += 1
+        await asyncio.sleep(max(0.0, self.random.gauss(self.latency, self.jitter)))
+
+        chat = self._chats.get(chat_id)
+        if chat is None:
+            chat = self._chats[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+
+        delay = max(self._global.delay(), chat.delay())
+        if delay > 0:
+            self.flood_errors += 1
+            raise RetryAfter(math.ceil(delay))
+
+        self._global.consume()
+        chat.consume()
+
+
+class BotMessage(FakeMessage):
+    def __init__(self, bot: FakeBot, chat: FakeChat, message_id: int, reply_markup: InlineKeyboardMarkup = None):
+        super().__init__(chat, message_id, reply_markup)
+        self.bot = bot
+        self.deleted = False
+
+    async def edit_reply_markup(self, reply_markup: InlineKeyboardMarkup = None):
+        await self.bot.request(self.chat.id)
+        self.reply_markup = reply_markup
+        return self
+
+    async def delete(self):
+        await self.bot.request(self.chat.id)
+        self.deleted = True
+        return True
+
+
+class Stats:
+    def __init__(self):
+        self.start_latencies: List[float] = []
+        self.click_latencies: List[float] = []
+        self.clicks: Dict[str, int] = {}
+        self.sessions = 0
+        self.selected = 0
+
+
+def _parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for item in value.split(','):
+        action, _, weight = item.partition('=')
+        mix[action.strip()] = float(weight)
+    return mix
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def _rss_kb() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource is not None else 0
+
+
+def _choose_button(rng: random.Random, datepicker: Datepicker, markup, mix: Dict[str, float]):
+    markup = getattr(markup, 'markup', markup)
+
+    buttons: Dict[str, List[InlineKeyboardButton]] = {}
+    for row in markup.inline_keyboard:
+        for button in row:
+            action = datepicker.callback_data.parse(button.callback_data)['action']
+            if action in mix:
+                buttons.setdefault(action, []).append(button)
+
+    if not buttons:
+        return None
+    actions = list(buttons)
+    action = rng.choices(actions, weights=[mix[action] for action in actions])[0]
+    return action, rng.choice(buttons[action])
+
+
+async def _simulate_user(user_id: int, args, datepicker: Datepicker, bot: FakeBot, stats: Stats, deadline: float):
+    rng = random.Random(args.seed * 100003 + user_id)
+    locale = rng.choice(args.locales) if args.locales else None
+    chat = FakeChat(user_id)
+    user = FakeUser(user_id, locale or 'en')
+    message_id = 0
+
+    await asyncio.sleep(rng.uniform(0, args.ramp))
+
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        markup = datepicker.start_calendar(locale=locale)
+        stats.start_latencies.append(time.perf_counter() - started)
+        stats.sessions += 1
+
+        message_id += 1
+        message = BotMessage(bot, chat, message_id, markup)
+
+        for _ in range(args.clicks):
+            await asyncio.sleep(min(rng.expovariate(1 / args.think), max(0.0, deadline - time.perf_counter())))
+            if time.perf_counter() >= deadline or message.deleted:
+                break
+
+            chosen = _choose_button(rng, datepicker, message.reply_markup, args.mix)
+            if chosen is None:
+                break
+            action, button = chosen
+
+            query = FakeCallbackQuery(button.callback_data, message, user)
+            started = time.perf_counter()
+            result = await datepicker.process(query, locale=locale)
+            stats.click_latencies.append(time.perf_counter() - started)
+            stats.clicks[action] = stats.clicks.get(action, 0) + 1
+
+            if result:
+                stats.selected += 1
+                break
+
+
+async def run(args) -> dict:
+    settings = DatepickerSettings(
+        views={
+            'day': {'footer': ['prev-month', 'select', 'next-month', ['today', 'cancel']]},
+            'month': {'footer': ['select', 'today']},
+        },
+        custom_actions=[TodayAction, CancelAction],
+        compact_callback=args.compact,
+        min_date=date.today() - timedelta(days=365 * 5) if args.restricted else None,
+        max_date=date.today() + timedelta(days=365 * 5) if args.restricted else None,
+    )
+    datepicker = Datepicker(
+        settings,
+        markup_cache=MarkupCache(maxsize=args.cache_size),
+        coalescer=NavigationCoalescer() if args.coalescer else None,
+        edit_scheduler=EditScheduler(rate=args.rate, chat_rate=args.chat_rate,
+                                     chat_burst=args.chat_burst) if args.scheduler else None,
+        serialize_markup=args.serialized,
+    )
+    bot = FakeBot(args.latency, args.jitter, args.rate, args.chat_rate, args.chat_burst, args.seed)
+    stats = Stats()
+
+    gc.collect()
+    if args.tracemalloc:
+        tracemalloc.start()
+    memory_before = tracemalloc.get_traced_memory()[0] if args.tracemalloc else 0
+    rss_before = _rss_kb()
+
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*(
+        _simulate_user(user_id, args, datepicker, bot, stats, deadline) for user_id in range(1, args.users + 1)
+    ))
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    memory_after = tracemalloc.get_traced_memory()[0] if args.tracemalloc else 0
+    if args.tracemalloc:
+        tracemalloc.stop()
+
+    stats.click_latencies.sort()
+    stats.start_latencies.sort()
+    report = {
+        'users': args.users,
+        'elapsed': round(elapsed, 2),
+        'sessions': stats.sessions,
+        'selected': stats.selected,
+        'clicks': sum(stats.clicks.values()),
+        'throughput': round(sum(stats.clicks.values()) / elapsed, 1),
+        'click_mix': dict(sorted(stats.clicks.items(), key=lambda item: -item[1])),
+        'click_latency_ms': {
+            name: round(_percentile(stats.click_latencies, q) * 1000, 2)
+            for name, q in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99), ('max', 1.0))
+        },
+        'start_latency_ms': {
+            name: round(_percentile(stats.start_latencies, q) * 1000, 3)
+            for name, q in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99))
+        },
+        'api_calls': bot.calls,
+        'flood_errors': bot.flood_errors,
+        'errors': datepicker.errors,
+        'skipped_edits': datepicker.skipped_edits,
+        'markup_cache': datepicker.views['day'].markup_cache.info(),
+        'rss_growth_kb': _rss_kb() - rss_before,
+    }
+    if args.tracemalloc:
+        report['heap_growth_kb'] = round((memory_after - memory_before) / 1024, 1)
+    if datepicker.coalescer is not None:
+        report['coalesced'] = datepicker.coalescer.coalesced
+    if datepicker.edit_scheduler is not None:
+        scheduler = datepicker.edit_scheduler
+        report['scheduler'] = {'sent': scheduler.sent, 'dropped': scheduler.dropped, 'retries': scheduler.retries}
+    return report
+
+
+def _print_report(report: dict):
+    for key, value in report.items():
+        if isinstance(value, dict):
+            value = '  '.join(f'{k}={v}' for k, v in value.items())
+        print(f'{key:<18} {value}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1000, help='number of simulated users')
+    parser.add_argument('--duration', type=float, default=30, help='test duration, seconds')
+    parser.add_argument('--ramp', type=float, default=5, help='users start uniformly within this time, seconds')
+    parser.add_argument('--think', type=float, default=1.0, help='mean pause between clicks, seconds')
+    parser.add_argument('--clicks', type=int, default=20, help='maximal clicks per calendar')
+    parser.add_argument('--mix', type=_parse_mix, default=DEFAULT_MIX,
+                        help='click weights per action, e.g. set-day=40,next-month=12,select=10')
+    parser.add_argument('--locales', type=lambda v: v.split(','), default=[],
+                        help='comma separated language codes assigned to users at random')
+    parser.add_argument('--latency', type=float, default=0.05, help='mean Bot API latency, seconds')
+    parser.add_argument('--jitter', type=float, default=0.02, help='Bot API latency deviation, seconds')
+    parser.add_argument('--rate', type=float, default=30, help='global Bot API requests per second')
+    parser.add_argument('--chat-rate', type=float, default=1, help='requests per second per chat')
+    parser.add_argument('--chat-burst', type=float, default=3, help='request burst per chat')
+    parser.add_argument('--cache-size', type=int, default=256, help='markup cache size, 0 disables caching')
+    parser.add_argument('--scheduler', action='store_true', help='send edits through EditScheduler')
+    parser.add_argument('--coalescer', action='store_true', help='coalesce navigation clicks')
+    parser.add_argument('--serialized', action='store_true', help='send pre-serialized markup')
+    parser.add_argument('--compact', action='store_true', help='use compact callback data')
+    parser.add_argument('--restricted', action='store_true', help='limit dates with min_date and max_date')
+    parser.add_argument('--tracemalloc', action='store_true', help='measure Python heap growth (slower)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    parser.add_argument('--verbose', action='store_true', help='log datepicker errors such as flood limits')
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.getLogger('aiogram_datepicker').setLevel(logging.CRITICAL)
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+
+if __name__ == '__main__':
+    main()
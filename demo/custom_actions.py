@@ -65,9 +65,12 @@ def _get_datepicker_settings():
     )
 
 
+datepicker_settings = _get_datepicker_settings()
+
+
 @dp.message_handler(state='*')
 async def _main(message: Message):
-    datepicker = Datepicker(_get_datepicker_settings())
+    datepicker = Datepicker.from_settings(datepicker_settings)
 
     markup = datepicker.start_calendar()
     await message.answer('Select a date: ', reply_markup=markup)
@@ -75,7 +78,7 @@ async def _main(message: Message):
 
 @dp.callback_query_handler(Datepicker.datepicker_callback.filter())
 async def _process_datepicker(callback_query: CallbackQuery, callback_data: dict):
-    datepicker = Datepicker(_get_datepicker_settings())
+    datepicker = Datepicker.from_settings(datepicker_settings)
 
     _date = await datepicker.process(callback_query, callback_data)
     if _date:
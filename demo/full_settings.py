@@ -1,6 +1,6 @@
 import logging
 import os
-from datetime import datetime, date
+from datetime import date
 
 from aiogram import Bot, Dispatcher
 from aiogram.types import InlineKeyboardButton
@@ -30,7 +30,6 @@ def _get_datepicker_settings():
 
     return DatepickerSettings(
         initial_view='month',
-        initial_date=datetime.now().date(),
         views={
             'day': {
                 'show_weekdays': False,
@@ -66,9 +65,12 @@ def _get_datepicker_settings():
     )
 
 
+datepicker_settings = _get_datepicker_settings()
+
+
 @dp.message_handler(state='*')
 async def _main(message: Message):
-    datepicker = Datepicker(_get_datepicker_settings())
+    datepicker = Datepicker.from_settings(datepicker_settings)
 
     markup = datepicker.start_calendar()
     await message.answer('Select a date: ', reply_markup=markup)
@@ -76,7 +78,7 @@ async def _main(message: Message):
 
 @dp.callback_query_handler(Datepicker.datepicker_callback.filter())
 async def _process_datepicker(callback_query: CallbackQuery, callback_data: dict):
-    datepicker = Datepicker(_get_datepicker_settings())
+    datepicker = Datepicker.from_settings(datepicker_settings)
 
     _date = await datepicker.process(callback_query, callback_data)
     if _date:
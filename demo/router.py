@@ -0,0 +1,43 @@
+import logging
+import os
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Message, CallbackQuery
+from aiogram.utils import executor
+
+from aiogram_datepicker import Datepicker, DatepickerSettings, DatepickerRouter
+
+logging.basicConfig(level=logging.INFO)
+
+bot = Bot(token=os.environ['API_TOKEN'])
+dp = Dispatcher(bot, run_tasks_by_default=True)
+
+router = DatepickerRouter(
+    Datepicker.from_settings(DatepickerSettings(namespace='in')),
+    Datepicker.from_settings(DatepickerSettings(namespace='out', views={'day': {'selection': 'range'}})),
+)
+
+
+@dp.message_handler(commands=['check_in'], state='*')
+async def _check_in(message: Message):
+    await message.answer('Check-in date: ', reply_markup=router['in'].start_calendar())
+
+
+@dp.message_handler(state='*')
+async def _main(message: Message):
+    await message.answer('Trip dates: ', reply_markup=router['out'].start_calendar())
+
+
+@dp.callback_query_handler(router.filter())
+async def _process_datepicker(callback_query: CallbackQuery, datepicker: Datepicker):
+    selected = await datepicker.process(callback_query)
+    if isinstance(selected, tuple):
+        await callback_query.message.answer(' - '.join(_date.strftime('%d/%m/%Y') for _date in selected))
+    elif selected:
+        await callback_query.message.answer(selected.strftime('%d/%m/%Y'))
+
+    await callback_query.answer()
+
+
+if __name__ == '__main__':
+    executor.start_polling(dp, skip_updates=True)
@@ -5,7 +5,7 @@ from aiogram import Bot, Dispatcher
 from aiogram.types import Message, CallbackQuery
 from aiogram.utils import executor
 
-from aiogram_datepicker import Datepicker, DatepickerSettings
+from aiogram_datepicker import Datepicker
 
 logging.basicConfig(level=logging.INFO)
 
@@ -15,7 +15,7 @@ dp = Dispatcher(bot, run_tasks_by_default=True)
 
 @dp.message_handler(state='*')
 async def _main(message: Message):
-    datepicker = Datepicker(DatepickerSettings())
+    datepicker = Datepicker.from_settings()
 
     markup = datepicker.start_calendar()
 
@@ -24,7 +24,7 @@ async def _main(message: Message):
 
 @dp.callback_query_handler(Datepicker.datepicker_callback.filter())
 async def _process_datepicker(callback_query: CallbackQuery, callback_data: dict):
-    datepicker = Datepicker(DatepickerSettings())
+    datepicker = Datepicker.from_settings()
 
     _date = await datepicker.process(callback_query, callback_data)
     if _date: